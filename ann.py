@@ -0,0 +1,207 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import profiling
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+DEFAULT_FEATURES = 2 ** 18
+MAX_SEGMENTS = 16
+_PARTS = ("data", "indices", "indptr", "ids")
+
+class _Segment:
+    # One insert batch as a term -> postings CSR matrix (features x docs).
+    # Removed documents stay in the postings, flagged in `deleted`, until
+    # the segment is merged.
+    __slots__ = ("postings", "ids", "norms", "deleted")
+
+    def __init__(self, postings: "sparse.csr_matrix", ids: np.ndarray, deleted: Optional[np.ndarray] = None):
+        self.postings = postings
+        self.ids = ids
+        self.norms: Optional[np.ndarray] = None
+        self.deleted = np.zeros(ids.shape[0], dtype=bool) if deleted is None else deleted
+
+class SemanticIndex:
+    # Inverted index over hashed term counts. A job description is scored
+    # against the whole pool with the same smoothed TF-IDF cosine as
+    # semantic_scores, but only the postings of the JD's own terms are read
+    # and no resume is re-tokenised. Results are approximate only through
+    # hash collisions and the JD not counting towards document frequencies.
+    # Inserts append a segment; segments live in .npy files opened as
+    # memory maps and are merged once there are more than MAX_SEGMENTS.
+    # Removal flags the document in its segment and takes it out of the
+    # document frequencies; merging drops flagged documents for good.
+    def __init__(self, path: Optional[str] = None, n_features: int = DEFAULT_FEATURES):
+        self.path = Path(path) if path is not None else None
+        self.n_features = n_features
+        self.n_docs = 0
+        self._df = np.zeros(n_features, dtype=np.int64)
+        self._segments: List[_Segment] = []
+        self._segment_names: List[str] = []
+        self._next_segment = 0
+        self._hasher = None
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if (self.path / "meta.json").exists():
+                self._open()
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def _counts(self, texts: Sequence[str]) -> "sparse.csr_matrix":
+        from sklearn.feature_extraction.text import HashingVectorizer
+        if self._hasher is None:
+            # Same tokenisation as TfidfVectorizer's defaults in embeddings.py
+            self._hasher = HashingVectorizer(n_features=self.n_features, alternate_sign=False, norm=None)
+        return self._hasher.transform(texts).astype(np.float32)
+
+    def _idf(self) -> np.ndarray:
+        return (np.log((1 + self.n_docs) / (1 + self._df)) + 1.0).astype(np.float32)
+
+    def _open(self) -> None:
+        meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        self.n_features = meta["n_features"]
+        self.n_docs = meta["n_docs"]
+        self._df = np.load(self.path / "df.npy")
+        self._next_segment = meta["next_segment"]
+        self._segment_names = list(meta["segments"])
+        self._segments = [self._load_segment(name) for name in self._segment_names]
+        for segment, positions in zip(self._segments, meta.get("deleted", [])):
+            segment.deleted[positions] = True
+
+    def _load_segment(self, name: str) -> _Segment:
+        from scipy import sparse
+        data, indices, indptr, ids = (np.load(self.path / f"{name}.{part}.npy", mmap_mode="r") for part in _PARTS)
+        return _Segment(sparse.csr_matrix((data, indices, indptr), shape=(self.n_features, ids.shape[0]), copy=False), ids)
+
+    def _store_segment(self, segment: _Segment) -> _Segment:
+        # Written once and reopened as a memory map; segments are never modified
+        if self.path is None:
+            return segment
+        name = f"seg{self._next_segment:06d}"
+        self._next_segment += 1
+        postings = segment.postings
+        for part, array in zip(_PARTS, (postings.data, postings.indices, postings.indptr, segment.ids)):
+            np.save(self.path / f"{name}.{part}.npy", array)
+        self._segment_names.append(name)
+        return self._load_segment(name)
+
+    def _write_meta(self) -> None:
+        np.save(self.path / "df.npy", self._df)
+        meta = {
+            "n_features": self.n_features,
+            "n_docs": self.n_docs,
+            "next_segment": self._next_segment,
+            "segments": self._segment_names,
+            "deleted": [np.flatnonzero(segment.deleted).tolist() for segment in self._segments],
+        }
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        tmp.replace(self.path / "meta.json")
+
+    def _merge_segments(self) -> None:
+        from scipy import sparse
+        live = [~segment.deleted for segment in self._segments]
+        postings = sparse.hstack(
+            [segment.postings[:, keep] for segment, keep in zip(self._segments, live)], format="csr", dtype=np.float32,
+        )
+        merged = _Segment(postings, np.concatenate([segment.ids[keep] for segment, keep in zip(self._segments, live)]))
+        old_names = self._segment_names
+        self._segment_names = []
+        self._segments = [self._store_segment(merged)]
+        if self.path is not None:
+            self._write_meta()
+            for old in old_names:
+                for part in _PARTS:
+                    (self.path / f"{old}.{part}.npy").unlink(missing_ok=True)
+
+    @profiling.instrument("ann.add")
+    def add_many(self, ids: Iterable[int], texts: Sequence[str]) -> None:
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if ids.shape[0] != len(texts):
+            raise ValueError("ids and texts must have the same length")
+        if not len(texts):
+            return
+        # Re-adding an id replaces its document
+        self.remove_many(ids)
+        counts = self._counts(texts)
+        self._df += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += len(texts)
+        self._segments.append(self._store_segment(_Segment(counts.T.tocsr(), ids)))
+        if self.path is not None:
+            self._write_meta()
+        # Document norms depend on the corpus IDF, which every insert changes
+        for existing in self._segments:
+            existing.norms = None
+        if len(self._segments) > MAX_SEGMENTS:
+            self._merge_segments()
+
+    def add(self, candidate_id: int, text: str) -> None:
+        self.add_many([candidate_id], [text])
+
+    @profiling.instrument("ann.remove")
+    def remove_many(self, ids: Iterable[int]) -> int:
+        ids = np.asarray(list(ids), dtype=np.int64)
+        removed = 0
+        for segment in self._segments:
+            hits = np.flatnonzero(np.isin(segment.ids, ids) & ~segment.deleted)
+            if not hits.shape[0]:
+                continue
+            # The postings are term-major, so a document's terms are the rows
+            # whose entries fall in its column
+            postings = segment.postings
+            entries = np.flatnonzero(np.isin(postings.indices, hits))
+            terms = np.searchsorted(postings.indptr, entries, side="right") - 1
+            self._df -= np.bincount(terms, minlength=self.n_features)
+            segment.deleted[hits] = True
+            removed += hits.shape[0]
+        if removed:
+            self.n_docs -= removed
+            for segment in self._segments:
+                segment.norms = None
+            if self.path is not None:
+                self._write_meta()
+        return removed
+
+    def remove(self, candidate_id: int) -> bool:
+        return self.remove_many([candidate_id]) > 0
+
+    def _norms(self, segment: _Segment, idf: np.ndarray) -> np.ndarray:
+        if segment.norms is None:
+            postings = segment.postings
+            weights = np.square(postings.data * np.repeat(idf, np.diff(postings.indptr)))
+            segment.norms = np.sqrt(np.bincount(postings.indices, weights=weights, minlength=postings.shape[1])).astype(np.float32)
+        return segment.norms
+
+    @profiling.instrument("ann.search")
+    def search(self, text: str, k: int) -> List[Tuple[int, float]]:
+        if k <= 0 or not self.n_docs:
+            return []
+        idf = self._idf()
+        query = self._counts([text])
+        terms = query.indices
+        weights = query.data * idf[terms]
+        query_norm = float(np.linalg.norm(weights))
+        if not query_norm:
+            return []
+        term_weights = (weights * idf[terms]).astype(np.float32)
+
+        best_ids = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for segment in self._segments:
+            norms = self._norms(segment, idf)
+            rows = segment.postings[terms]
+            dots = rows.T @ term_weights
+            scores = np.divide(dots, norms * query_norm, out=np.zeros_like(dots), where=norms > 0)
+            live = ~segment.deleted
+            best_ids = np.concatenate([best_ids, segment.ids[live]])
+            best_scores = np.concatenate([best_scores, scores[live]])
+            if best_scores.shape[0] > k:
+                top = np.argpartition(-best_scores, k - 1)[:k]
+                best_ids, best_scores = best_ids[top], best_scores[top]
+        order = np.lexsort((best_ids, -best_scores))
+        return [(int(best_ids[i]), float(best_scores[i])) for i in order]
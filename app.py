@@ -1,15 +1,21 @@
 import streamlit as st
 import pandas as pd
+import os
 import re
-from pathlib import Path
+import contextlib
 
 st.set_page_config(page_title="Skill-Sync: AI Resume Screener", layout="wide")
 
-from parser import parse_resume, extract_text
-from matcher import calculate_skills_match, calculate_experience_match, calculate_education_match, _SKILL_KEYWORDS
-from embeddings import generate_embedding, cosine_similarity
-from scorer import calculate_total_score, rank_candidates
+import screening
+import profiling
+from parser import get_nlp, warm_up
+from cache import ParseCache
+from dedup import DEFAULT_DEDUP_PATH, DEFAULT_THRESHOLD, DuplicateIndex
 from explainer import generate_explanation
+from matcher import _parse_years_range
+from pipeline import ScreeningPipeline, session_from_results
+from scorer import WEIGHTS, COMPONENTS
+from skills import get_taxonomy
 
 st.markdown("""
 <style>
@@ -46,95 +52,288 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def _prepare_resume_text(file_path: str) -> str:
-    return extract_text(file_path)
-
-def extract_req_experience(job_description: str) -> str:
-    # Look for patterns like "0-1 Year", "3-5 years", "2+ years"
-    # Handles various dashes (hyphen, en-dash, em-dash)
-    pattern = r"(\d+)(?:\s*[-–]\s*(\d+))?\s*(?:years?|yrs?)"
-    match = re.search(pattern, job_description, re.IGNORECASE)
-    if match:
-        min_exp = match.group(1)
-        max_exp = match.group(2)
-        if max_exp:
-            return f"{min_exp}-{max_exp}"
-        else:
-            # Handle "3+ years" case -> treat as 3-10
-            return f"{min_exp}-10"
-    return "0-100" # Default fallback if no experience mentioned
+@st.cache_resource
+def _get_parse_cache() -> ParseCache:
+    return ParseCache()
+
+@st.cache_resource
+def _get_dedup_index() -> DuplicateIndex:
+    # Signatures persist across sessions so re-applications are caught too
+    return DuplicateIndex(DEFAULT_DEDUP_PATH)
+
+@st.cache_resource
+def _start_warm_up():
+    # Load spaCy in the background once per server process so the page renders
+    # immediately and the first screening finds the model ready
+    return warm_up(background=True)
+
+@st.cache_resource
+def _get_nlp():
+    return get_nlp()
 
-def screen_resumes(resume_files, job_description):
-    job_emb = generate_embedding(job_description)
+def _progress_reporter(total_files):
+    progress_bar = st.progress(0)
+    status_text = st.empty()
     
-    # Extract experience requirement dynamically
-    req_experience = extract_req_experience(job_description)
+    def _on_progress(done, outcome):
+        progress_bar.progress(done / total_files)
+        if outcome.error:
+            st.warning(f"Skipped {outcome.name}: {outcome.error}")
+        else:
+            status_text.text(f"Processed {outcome.name}")
     
-    candidates = []
+    def _clear():
+        status_text.empty()
+        progress_bar.empty()
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    status_text.text(f"Parsing {total_files} resumes...")
+    return _on_progress, _clear
+
+def screen_resumes(resume_files, job_description, dedup_threshold=None):
+    on_progress, clear_progress = _progress_reporter(len(resume_files))
+    _get_nlp()
+    # The index is shared by every session, so the threshold goes with each
+    # lookup instead of being set on it
+    dedup = _get_dedup_index() if dedup_threshold is not None else None
+    # Uploads are read by the pipeline's ingest stage as it has room, and
+    # progress follows completion order rather than upload order. Only the
+    # parse outcomes are used, so the pipeline's score stage is left out.
+    pipeline = ScreeningPipeline(
+        job_description, cache=_get_parse_cache(), dedup=dedup, workers=min(os.cpu_count() or 1, len(resume_files)),
+        dedup_threshold=dedup_threshold, score=False,
+    )
+    uploads = ((uploaded.name, uploaded.getvalue()) for uploaded in resume_files)
+    results = []
+    for done, result in enumerate(pipeline.stream(uploads), start=1):
+        on_progress(done, result.outcome)
+        results.append(result)
+    clear_progress()
+    if dedup is not None:
+        dedup.save()
+    return session_from_results(job_description, results), pipeline.metrics()
+
+def screen_roles(resume_files, job_descriptions):
+    uploads = [(uploaded.name, uploaded.getvalue()) for uploaded in resume_files]
+    on_progress, clear_progress = _progress_reporter(len(uploads))
+    _get_nlp()
+    result = screening.screen_matrix(uploads, job_descriptions, cache=_get_parse_cache(), on_progress=on_progress)
+    clear_progress()
+    return result
+
+def _split_job_descriptions(text):
+    parts = re.split(r"^\s*---+\s*$", text, flags=re.MULTILINE)
+    return [part.strip() for part in parts if part.strip()]
+
+def _role_title(job_description, index):
+    first_line = job_description.strip().splitlines()[0]
+    return f"Role {index + 1}: {first_line[:40]}"
+
+def _render_role_matrix(result, job_descriptions):
+    st.success(f"Scored {len(result['names'])} candidates against {len(job_descriptions)} roles!")
+    titles = [_role_title(jd, j) for j, jd in enumerate(job_descriptions)]
     
-    total_files = len(resume_files)
+    st.markdown("### Best Role per Candidate")
+    best_rows = sorted(result["best_roles"], key=lambda row: row["total_score"], reverse=True)
+    st.dataframe(pd.DataFrame([
+        {"Name": row["name"], "Best Role": titles[row["best_job"]], "Score": f"{row['total_score']*100:.1f}%"}
+        for row in best_rows
+    ]), use_container_width=True, hide_index=True)
     
-    for i, uploaded in enumerate(resume_files):
-        status_text.text(f"Processing {uploaded.name}...")
-        
-        file_path = uploaded.name
-        with open(file_path, "wb") as f:
-            f.write(uploaded.getbuffer())
-            
-        parsed = parse_resume(file_path)
-        name = parsed.get("name", Path(file_path).stem)
-        
-        # Use regex to split words, handling punctuation like "Python," correctly
-        job_words = {t.lower() for t in re.findall(r"[A-Za-z0-9#+.]+", job_description)}
-        required_skills = [s for s in _SKILL_KEYWORDS if s in job_words]
-        skill_match = calculate_skills_match(parsed.get("skills", []), required_skills, [])
-        
-        exp_match = calculate_experience_match(parsed.get("total_experience_years", 0), req_experience)
-        edu_match = calculate_education_match(parsed.get("education", []), "bachelor")
-        
-        resume_text = _prepare_resume_text(file_path)
-        semantic_score = cosine_similarity(generate_embedding(resume_text), job_emb)
-        
-        components = {
-            "skills": skill_match["skill_score"],
-            "experience": exp_match["experience_score"],
-            "education": edu_match["education_score"],
-            "semantic": semantic_score,
-        }
-        total_score = calculate_total_score(components)
-        
-        candidate = {
-            "name": name,
-            "total_score": total_score,
-            "skills_score": skill_match["skill_score"],
-            "matched_required": skill_match["matched_required"],
-            "missing_required": skill_match["missing_required"],
-            "matched_preferred": skill_match["matched_preferred"],
-            "missing_preferred": skill_match["missing_preferred"],
-            "experience_score": exp_match["experience_score"],
-            "candidate_years": exp_match["candidate_years"],
-            "required_range": exp_match["required_range"],
-            "education_score": edu_match["education_score"],
-            "required_degree": edu_match["required_degree"],
-            "semantic_score": semantic_score,
-        }
-        candidates.append(candidate)
-        progress_bar.progress((i + 1) / total_files)
-
-    status_text.empty()
-    progress_bar.empty()
+    st.markdown("### Rankings by Role")
+    for tab, title, ranking in zip(st.tabs(titles), titles, result["rankings"]):
+        with tab:
+            st.dataframe(pd.DataFrame([
+                {
+                    "Rank": row["rank"],
+                    "Name": row["name"],
+                    "Total Score": f"{row['total_score']*100:.1f}%",
+                    "Skills Match": f"{row['skills_score']*100:.0f}%",
+                    "Experience": f"{row['experience_score']*100:.0f}%",
+                    "Semantic": f"{row['semantic_score']*100:.0f}%",
+                }
+                for row in ranking
+            ]), use_container_width=True, hide_index=True)
+
+DEGREE_OPTIONS = ["bachelor", "master", "ph.d", "doctor", "associate"]
+MAX_YEARS = 50
+# Upper bound used for "no upper limit", matching extract_req_experience's fallback
+MAX_UNBOUNDED_YEARS = 100
+
+def _tuning_controls(session, run_id):
+    # Widget keys carry the run id so every new analysis starts from the
+    # requirements extracted from its own job description
+    st.sidebar.header("Tune Ranking")
+    st.sidebar.caption("Adjusting these re-ranks the current candidates without re-parsing.")
+    weights = {
+        key: st.sidebar.slider(f"{key.title()} weight", 0.0, 1.0, float(WEIGHTS[key]), 0.05, key=f"weight_{key}_{run_id}")
+        for key in COMPONENTS
+    }
+    if sum(weights.values()) > 0:
+        session.set_weights(weights)
+    else:
+        st.sidebar.warning("At least one weight must be above zero.")
+
+    # A JD without stated years yields "0-100"; anything past the widget's
+    # range is shown as "no upper limit" and kept as it was extracted
+    min_req, max_req = _parse_years_range(session.requirements["experience_range"])
+    min_years = st.sidebar.number_input("Minimum years", 0, MAX_YEARS, min(min_req, MAX_YEARS), key=f"min_years_{run_id}")
+    no_max = st.sidebar.checkbox("No upper limit", max_req > MAX_YEARS, key=f"no_max_years_{run_id}")
+    max_years = st.sidebar.number_input(
+        "Maximum years", 0, MAX_YEARS, min(max(max_req, min_years), MAX_YEARS), key=f"max_years_{run_id}", disabled=no_max,
+    )
+    if no_max:
+        max_years = max(max_req, MAX_UNBOUNDED_YEARS)
+    session.set_experience_range(f"{min_years}-{max(max_years, min_years)}")
+
+    degree = session.requirements["degree"]
+    session.set_degree(st.sidebar.selectbox(
+        "Required degree", DEGREE_OPTIONS, index=DEGREE_OPTIONS.index(degree) if degree in DEGREE_OPTIONS else 0, key=f"degree_{run_id}"
+    ))
+
+    required = session.requirements["required_skills"]
+    session.set_required_skills(st.sidebar.multiselect(
+        "Required skills", sorted(get_taxonomy().canonical | set(required)), default=required, key=f"skills_{run_id}"
+    ))
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+def _render_results(session, run_id):
+    # Only the current page is materialised as candidate records, and an
+    # explanation is only generated while its expander is open, so render
+    # cost follows what is on screen rather than the size of the pool
+    total = len(session.names)
+    if not total:
+        st.info("No candidates to rank: every upload failed to parse or was skipped.")
+        return
+
+    st.markdown("### Top Candidates")
     
-    ranked = rank_candidates(candidates)
+    top_cols = st.columns(3)
+    for i, cand in enumerate(session.ranked(3)):
+        with top_cols[i]:
+            score = cand['total_score'] * 100
+            st.metric(
+                label=f"Rank #{cand['rank']}", 
+                value=f"{score:.1f}%", 
+                delta=cand['name']
+            )
     
-    for cand in ranked:
-        cand["explanation_text"] = generate_explanation(cand)
-        
-    return ranked
+    st.markdown("---")
+    st.subheader("Detailed Rankings")
+
+    f1, f2, f3, f4 = st.columns(4)
+    with f1:
+        top_n = st.number_input("Show top", 1, total, min(total, 100), key=f"top_n_{run_id}")
+    with f2:
+        min_score = st.slider("Minimum score (%)", 0, 100, 0, 5, key=f"min_score_{run_id}")
+    with f3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"page_size_{run_id}")
+    # Rankings are by descending total, so the score filter keeps a prefix
+    shown = min(int(top_n), int((session.totals >= min_score / 100).sum()))
+    pages = max(1, -(-shown // page_size))
+    page_key = f"page_{run_id}"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with f4:
+        page = st.number_input("Page", 1, pages, key=page_key)
+
+    offset = (page - 1) * page_size
+    candidates = session.ranked(min(shown, offset + page_size), offset=offset) if shown else []
+    st.caption(f"Showing {offset + 1 if candidates else 0}-{offset + len(candidates)} of {shown} candidates ({total} screened)")
+    
+    summary_data = []
+    for cand in candidates:
+        summary_data.append({
+            "Rank": cand["rank"],
+            "Name": cand["name"],
+            "Total Score": f"{cand['total_score']*100:.1f}%",
+            "Skills Match": f"{cand['skills_score']*100:.0f}%",
+            "Experience": f"{cand['candidate_years']} yrs",
+            "Duplicates": len(cand.get("duplicates", [])),
+        })
+    st.dataframe(pd.DataFrame(summary_data), use_container_width=True, hide_index=True)
+    
+    st.markdown("### Candidate Insights")
+    for cand in candidates:
+        duplicates = cand.get("duplicates", [])
+        suffix = f" (+{len(duplicates)} near-duplicates)" if duplicates else ""
+        # The key changes with the candidate at this rank, so re-ranking
+        # never leaves someone else's insights open
+        insight = st.expander(
+            f"#{cand['rank']} {cand['name']} - Score: {cand['total_score']*100:.1f}%{suffix}",
+            key=f"insight_{run_id}_{cand['rank']}_{cand['name']}",
+            on_change="rerun",
+        )
+        if not insight.open:
+            continue
+        explanation_text = generate_explanation(cand)
+        with insight:
+            c1, c2 = st.columns([2, 1])
+            with c1:
+                st.markdown(f"**Recommendation:**")
+                rec = explanation_text.split('\n')[-1]
+                st.info(rec)
+                
+                st.code(explanation_text, language="text")
+            
+            with c2:
+                st.progress(cand['total_score'], text="Overall Score")
+                st.progress(cand['skills_score'], text="Skills Match")
+                st.progress(cand['experience_score'], text="Experience Match")
+                st.progress(cand['semantic_score'], text="Semantic Match")
+
+def _render_performance(profile):
+    with st.expander("Performance"):
+        stages = profile["stages"]
+        if not stages:
+            st.write("No timings were recorded.")
+            return
+        stage_rows = [
+            {
+                "Stage": stage,
+                "Calls": stats["count"],
+                "Total (s)": round(stats["total_s"], 4),
+                "Mean (ms)": round(stats["total_s"] / stats["count"] * 1000, 3) if stats["count"] else 0.0,
+                "Max (ms)": round(stats["max_s"] * 1000, 3),
+            }
+            for stage, stats in sorted(stages.items(), key=lambda kv: kv[1]["total_s"], reverse=True)
+        ]
+        st.dataframe(pd.DataFrame(stage_rows), use_container_width=True, hide_index=True)
+        slowest = profile["slowest"].get("parser.extract_text", [])
+        if slowest:
+            st.markdown("**Slowest files (text extraction)**")
+            st.dataframe(
+                pd.DataFrame([{"File": entry["item"], "Seconds": round(entry["seconds"], 4)} for entry in slowest]),
+                use_container_width=True,
+                hide_index=True,
+            )
+        pipeline = profile.get("pipeline")
+        if pipeline:
+            st.markdown("**Pipeline stages**")
+            st.dataframe(pd.DataFrame([
+                {
+                    "Stage": stage,
+                    "Workers": stats["concurrency"],
+                    "Processed": stats["processed"],
+                    "Failed": stats["failed"],
+                    "Peak queue": stats["max_queue_depth"],
+                    "Busy (s)": round(stats["busy_s"], 4),
+                }
+                for stage, stats in pipeline.items() if "processed" in stats
+            ]), use_container_width=True, hide_index=True)
+        dl1, dl2 = st.columns(2)
+        with dl1:
+            st.download_button("Download JSON", profiling.to_json(profile), file_name="skillsync_profile.json")
+        with dl2:
+            st.download_button("Download Prometheus", profiling.to_prometheus(data=profile), file_name="skillsync_profile.prom")
+
+def _profiled(enabled):
+    # Each run gets its own collector, so concurrent sessions never reset or
+    # mix each other's timings, and collection stops even if screening raises
+    return profiling.collect() if enabled else contextlib.nullcontext()
 
 def main():
+    _start_warm_up()
     st.title("Skill-Sync")
     st.markdown("### AI-Powered Resume Screening & Ranking System")
     st.markdown("---")
@@ -157,63 +356,62 @@ def main():
             height=250,
             placeholder="e.g. Senior Software Engineer with Python, React, and AWS experience..."
         )
+        multi_role = st.checkbox(
+            "Screen against multiple roles",
+            help="Separate job descriptions with a line containing only ---",
+        )
+        collapse_duplicates = st.checkbox(
+            "Collapse near-duplicate resumes",
+            value=True,
+            help="Re-applications, format conversions and lightly edited copies are listed under one candidate",
+        )
+        dedup_threshold = st.slider(
+            "Duplicate similarity threshold", 0.5, 1.0, DEFAULT_THRESHOLD, 0.05, disabled=not collapse_duplicates,
+        )
 
     st.markdown("---")
     analyze_col1, analyze_col2, analyze_col3 = st.columns([1, 2, 1])
     with analyze_col2:
         analyze_clicked = st.button("Analyze Candidates")
+        profile_run = st.checkbox("Collect performance data")
 
     if analyze_clicked:
         if not resume_files:
             st.warning("Please upload at least one resume.")
         elif not job_description:
             st.warning("Please provide a job description.")
+        elif multi_role and len(_split_job_descriptions(job_description)) > 1:
+            st.session_state.pop("screening", None)
+            job_descriptions = _split_job_descriptions(job_description)
+            with _profiled(profile_run) as profiler:
+                result = screen_roles(resume_files, job_descriptions)
+            _render_role_matrix(result, job_descriptions)
+            if profiler is not None:
+                _render_performance(profiler.snapshot())
         else:
-            candidates = screen_resumes(resume_files, job_description)
-            
-            st.success(f"Successfully analyzed {len(candidates)} candidates!")
-            st.markdown("### Top Candidates")
-            
-            top_cols = st.columns(3)
-            for i, cand in enumerate(candidates[:3]):
-                with top_cols[i]:
-                    score = cand['total_score'] * 100
-                    st.metric(
-                        label=f"Rank #{cand['rank']}", 
-                        value=f"{score:.1f}%", 
-                        delta=cand['name']
-                    )
-            
-            st.markdown("---")
-            st.subheader("Detailed Rankings")
-            
-            summary_data = []
-            for cand in candidates:
-                summary_data.append({
-                    "Rank": cand["rank"],
-                    "Name": cand["name"],
-                    "Total Score": f"{cand['total_score']*100:.1f}%",
-                    "Skills Match": f"{cand['skills_score']*100:.0f}%",
-                    "Experience": f"{cand['candidate_years']} yrs",
-                })
-            st.dataframe(pd.DataFrame(summary_data), use_container_width=True, hide_index=True)
-            
-            st.markdown("### Candidate Insights")
-            for cand in candidates:
-                with st.expander(f"#{cand['rank']} {cand['name']} - Score: {cand['total_score']*100:.1f}%"):
-                    c1, c2 = st.columns([2, 1])
-                    with c1:
-                        st.markdown(f"**Recommendation:**")
-                        rec = cand['explanation_text'].split('\n')[-1]
-                        st.info(rec)
-                        
-                        st.code(cand['explanation_text'], language="text")
-                    
-                    with c2:
-                        st.progress(cand['total_score'], text="Overall Score")
-                        st.progress(cand['skills_score'], text="Skills Match")
-                        st.progress(cand['experience_score'], text="Experience Match")
-                        st.progress(cand['semantic_score'], text="Semantic Match")
+            with _profiled(profile_run) as profiler:
+                session, pipeline_metrics = screen_resumes(resume_files, job_description, dedup_threshold if collapse_duplicates else None)
+            st.session_state["screening"] = session
+            st.session_state["screening_run"] = st.session_state.get("screening_run", 0) + 1
+            st.session_state["screening_profile"] = {**profiler.snapshot(), "pipeline": pipeline_metrics} if profiler is not None else None
+
+    # Results live in session state so slider changes re-rank the parsed
+    # candidates on rerun instead of screening the uploads again
+    session = st.session_state.get("screening")
+    if session is not None:
+        run_id = st.session_state["screening_run"]
+        _tuning_controls(session, run_id)
+        
+        st.success(f"Successfully analyzed {len(session.names)} candidates!")
+        cache_stats = _get_parse_cache().stats()
+        st.caption(
+            f"Parse cache: {cache_stats['memory_hits'] + cache_stats['disk_hits']} hits, "
+            f"{cache_stats['misses']} misses ({cache_stats['hit_rate']*100:.0f}% hit rate)"
+        )
+        _render_results(session, run_id)
+        
+        if st.session_state.get("screening_profile"):
+            _render_performance(st.session_state["screening_profile"])
 
 if __name__ == "__main__":
     main()
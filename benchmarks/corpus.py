@@ -0,0 +1,129 @@
+import random
+from pathlib import Path
+from typing import Dict, List
+
+import docx
+
+from skills import get_taxonomy
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Priya", "Wei"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Patel", "Chen"]
+COMPANIES = ["Acme Corp", "Globex Corporation", "Initech", "Umbrella Corporation", "Stark Industries", "Wayne Enterprises",
+             "Hooli", "Pied Piper", "Soylent Corp", "Cyberdyne Systems", "Tyrell Corporation", "Vandelay Industries"]
+UNIVERSITIES = ["Stanford University", "Massachusetts Institute of Technology", "University of Michigan",
+                "Georgia Institute of Technology", "University of Texas", "Carnegie Mellon University"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Analyst", "Lead Developer", "Solutions Architect",
+          "Engineering Manager", "Junior Developer", "Backend Engineer"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Data Science",
+           "Bachelor of Engineering in Electrical Engineering", "Ph.D in Machine Learning", "Associate of Applied Science in IT"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+FILLER = ("Delivered features across the stack, collaborated with product and design, improved reliability "
+          "and reduced latency, mentored teammates and owned services end to end in production.").split()
+
+SIZES = {"small": 2, "medium": 5, "large": 12}
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(FILLER) for _ in range(words)).capitalize() + "."
+
+def generate_resume(rng: random.Random, size: str = "medium") -> str:
+    jobs = SIZES[size]
+    skills = sorted(get_taxonomy().canonical)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    lines = [
+        name,
+        f"{handle}@example.com | (555) {rng.randint(200, 999)}-{rng.randint(1000, 9999)} | linkedin.com/in/{handle.replace('.', '-')}",
+        "",
+        "Summary",
+        _sentence(rng, 25),
+        "",
+        "Skills",
+        ", ".join(rng.sample(skills, rng.randint(6, 18))),
+        "",
+        "Professional Experience",
+    ]
+    year = 2024
+    for _ in range(jobs):
+        length = rng.randint(1, 4)
+        start_year = year - length
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} {rng.choice(MONTHS)} {start_year} - {rng.choice(MONTHS)} {year}")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"- {_sentence(rng, rng.randint(10, 22))}")
+        year = start_year
+    lines += ["", "Education"]
+    for _ in range(rng.randint(1, 2)):
+        lines.append(f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}")
+    return "\n".join(lines) + "\n"
+
+def generate_job_description(rng: random.Random) -> str:
+    skills = sorted(get_taxonomy().canonical)
+    low = rng.randint(0, 6)
+    return (
+        f"We are hiring a {rng.choice(TITLES)} with {low}-{low + rng.randint(2, 5)} years of experience.\n"
+        f"Required skills: {', '.join(rng.sample(skills, rng.randint(4, 10)))}.\n"
+        "A bachelor degree in a related field is required.\n"
+        f"{_sentence(rng, 40)}\n"
+    )
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace").decode("latin-1")
+
+def write_pdf(text: str, path: Path, lines_per_page: int = 50) -> None:
+    # Minimal single-font PDF writer so the corpus needs no extra dependency
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    objects: List[bytes] = []
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = "BT /F1 10 Tf 14 TL 50 780 Td\n" + "\n".join(f"({_pdf_escape(line)}) Tj T*" for line in page_lines) + "\nET"
+        body = stream.encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length " + str(len(body)).encode() + b" >>\nstream\n" + body + b"\nendstream")
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+
+def write_docx(text: str, path: Path) -> None:
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(str(path))
+
+def write_corpus(directory: str, count: int, formats: List[str], size: str = "medium", seed: int = 0, jd_count: int = 1) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    resumes = []
+    for i in range(count):
+        text = generate_resume(rng, size)
+        fmt = formats[i % len(formats)]
+        path = root / f"resume_{i:05d}.{fmt}"
+        if fmt == "pdf":
+            write_pdf(text, path)
+        elif fmt == "docx":
+            write_docx(text, path)
+        else:
+            path.write_text(text, encoding="utf-8")
+        resumes.append(str(path))
+    jds = []
+    for i in range(jd_count):
+        path = root / f"jd_{i:02d}.txt"
+        path.write_text(generate_job_description(rng), encoding="utf-8")
+        jds.append(str(path))
+    return {"resumes": resumes, "job_descriptions": jds}
@@ -0,0 +1,90 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ann import SemanticIndex
+from embeddings import semantic_scores
+from parser import ParseOutcome, parse_texts
+from scorer import rank_order
+from screening import session_from_outcomes, shortlist_session
+from store import CandidateStore
+from benchmarks.corpus import generate_job_description, generate_resume
+
+def _recall(expected: List[str], got: List[str]) -> float:
+    return len(set(expected) & set(got)) / len(expected) if expected else 1.0
+
+def run_prefilter_benchmark(
+    texts: List[str],
+    job_descriptions: List[str],
+    top_k: int = 200,
+    oversamples: List[float] = (1.0, 2.0, 4.0, 8.0),
+) -> Dict[str, Any]:
+    store = CandidateStore()
+    ids = store.add_many({"parsed": parsed, "raw_text": text} for parsed, text in zip(parse_texts(texts), texts))
+    index = SemanticIndex()
+    start = time.perf_counter()
+    index.add_many(ids, texts)
+    results = {"index_build_s": time.perf_counter() - start, "queries": []}
+    outcomes = [ParseOutcome(i, str(cid), store.get(cid)["raw_text"], store.get(cid)["parsed"], None) for i, cid in enumerate(ids)]
+
+    for job_description in job_descriptions:
+        query = {}
+        start = time.perf_counter()
+        exact_semantic = semantic_scores(job_description, texts)
+        query["exact_semantic_s"] = time.perf_counter() - start
+        start = time.perf_counter()
+        found = index.search(job_description, top_k)
+        query["index_search_s"] = time.perf_counter() - start
+        expected = [str(ids[i]) for i in rank_order(exact_semantic, top_k)]
+        query["semantic_recall"] = _recall(expected, [str(cid) for cid, _ in found])
+
+        # Ground truth for the full weighted score is exact scoring of every resume
+        start = time.perf_counter()
+        session = session_from_outcomes(job_description, outcomes)
+        expected = [session.files[i] for i in rank_order(session.totals, top_k)]
+        query["exact_screen_s"] = time.perf_counter() - start
+        query["shortlists"] = []
+        for oversample in oversamples:
+            start = time.perf_counter()
+            shortlisted = shortlist_session(store, index, job_description, top_k, oversample)
+            elapsed = time.perf_counter() - start
+            got = [shortlisted.files[i] for i in rank_order(shortlisted.totals, top_k)]
+            query["shortlists"].append({"oversample": oversample, "seconds": elapsed, "recall": _recall(expected, got)})
+        results["queries"].append(query)
+    return results
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Semantic prefilter index versus exact scoring of the whole pool")
+    arg_parser.add_argument("--count", type=int, default=10000, help="Number of synthetic resumes in the pool")
+    arg_parser.add_argument("--jd-count", type=int, default=3)
+    arg_parser.add_argument("--top-k", type=int, default=200)
+    arg_parser.add_argument("--oversample", default="1,2,4,8", help="Comma-separated shortlist multipliers of top-k")
+    arg_parser.add_argument("--size", choices=["small", "medium", "large"], default="medium")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--output", default="bench_prefilter.json")
+    args = arg_parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    texts = [generate_resume(rng, args.size) for _ in range(args.count)]
+    job_descriptions = [generate_job_description(rng) for _ in range(args.jd_count)]
+    oversamples = [float(o) for o in args.oversample.split(",") if o.strip()]
+    results = run_prefilter_benchmark(texts, job_descriptions, args.top_k, oversamples)
+    results["config"] = {"count": args.count, "jd_count": args.jd_count, "top_k": args.top_k, "size": args.size, "seed": args.seed}
+    results["environment"] = {"python": platform.python_version(), "platform": platform.platform()}
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"index build {results['index_build_s']:.2f}s for {args.count} resumes")
+    for j, query in enumerate(results["queries"]):
+        print(f"JD {j}: semantic exact {query['exact_semantic_s'] * 1000:9.1f} ms  index {query['index_search_s'] * 1000:7.1f} ms  "
+              f"recall {query['semantic_recall']:.3f}  |  full screen {query['exact_screen_s'] * 1000:9.1f} ms")
+        for shortlist in query["shortlists"]:
+            print(f"    oversample {shortlist['oversample']:4g}  {shortlist['seconds'] * 1000:9.1f} ms  top-{args.top_k} recall {shortlist['recall']:.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import argparse
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from parser import extract_text, parse_resume, warm_up
+from matcher import calculate_skills_match, calculate_experience_match, calculate_education_match
+from embeddings import semantic_scores
+from scorer import calculate_total_score, rank_candidates
+from explainer import generate_explanation
+from screening import build_requirements, score_parsed
+from benchmarks.corpus import write_corpus
+
+def _process_peak_rss_mb() -> float:
+    # High-water mark of the whole process so far, not of the stage: a stage
+    # that follows a larger one reports the same number
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _summarise(latencies: List[float], items: int, batch_size: int = 1) -> Dict[str, Any]:
+    # Latencies of whole-batch calls are divided by batch_size, so p50 and
+    # p95 are per item for every stage
+    samples = np.asarray(latencies, dtype=np.float64)
+    total = float(samples.sum())
+    per_item = samples / max(batch_size, 1)
+    return {
+        "items": items,
+        "total_s": total,
+        "throughput_per_s": items / total if total else 0.0,
+        "p50_ms": float(np.percentile(per_item, 50) * 1000) if samples.size else 0.0,
+        "p95_ms": float(np.percentile(per_item, 95) * 1000) if samples.size else 0.0,
+        "process_peak_rss_mb": _process_peak_rss_mb(),
+    }
+
+def _time_each(func: Callable[[Any], Any], inputs: List[Any]) -> Tuple[List[Any], List[float]]:
+    latencies = []
+    results = []
+    for item in inputs:
+        start = time.perf_counter()
+        results.append(func(item))
+        latencies.append(time.perf_counter() - start)
+    return results, latencies
+
+def _time_repeated(func: Callable[[], Any], repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def run_benchmarks(resume_paths: List[str], job_description: str, repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    stages = {}
+    n = len(resume_paths)
+
+    # spaCy, the document libraries and the taxonomy load on first use; load
+    # them and parse one resume of each format untimed, so the first timed
+    # calls don't pay for it
+    formats = {Path(path).suffix.lower(): path for path in resume_paths}
+    warm_up(formats)
+    for path in formats.values():
+        parse_resume(path)
+
+    texts, latencies = _time_each(extract_text, resume_paths)
+    stages["extract_text"] = _summarise(latencies, n)
+
+    parsed, latencies = _time_each(parse_resume, resume_paths)
+    stages["parse_resume"] = _summarise(latencies, n)
+
+    requirements = build_requirements(job_description)
+    _, latencies = _time_each(
+        lambda p: calculate_skills_match(p.get("skills", []), requirements["required_skills"], requirements["preferred_skills"]), parsed)
+    stages["skills_match"] = _summarise(latencies, n)
+    _, latencies = _time_each(
+        lambda p: calculate_experience_match(p.get("total_experience_years", 0), requirements["experience_range"]), parsed)
+    stages["experience_match"] = _summarise(latencies, n)
+    _, latencies = _time_each(lambda p: calculate_education_match(p.get("education", []), requirements["degree"]), parsed)
+    stages["education_match"] = _summarise(latencies, n)
+
+    scores = semantic_scores(job_description, texts)
+    latencies = _time_repeated(lambda: semantic_scores(job_description, texts), repeat)
+    stages["semantic_scores"] = _summarise(latencies, n * repeat, n)
+
+    candidates = []
+    for i, p in enumerate(parsed):
+        candidate, components = score_parsed(p.get("name", ""), p, requirements)
+        components["semantic"] = float(scores[i])
+        candidate["semantic_score"] = float(scores[i])
+        candidate["total_score"] = calculate_total_score(components)
+        candidates.append(candidate)
+    latencies = _time_repeated(lambda: rank_candidates([dict(c) for c in candidates]), repeat)
+    stages["rank_candidates"] = _summarise(latencies, n * repeat, n)
+
+    ranked = rank_candidates(candidates)
+    _, latencies = _time_each(generate_explanation, ranked)
+    stages["generate_explanation"] = _summarise(latencies, n)
+    return stages
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    lines = []
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before.get("p50_ms"):
+            lines.append(f"{stage:22s} p50 {stats['p50_ms']:9.3f} ms (new)")
+            continue
+        change = (stats["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        lines.append(f"{stage:22s} p50 {before['p50_ms']:9.3f} -> {stats['p50_ms']:9.3f} ms ({change:+.1f}%)")
+    return lines
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Stage-level Skill-Sync benchmarks on a synthetic corpus")
+    arg_parser.add_argument("--count", type=int, default=200, help="Number of synthetic resumes")
+    arg_parser.add_argument("--formats", default="txt,docx,pdf", help="Comma-separated formats to generate")
+    arg_parser.add_argument("--size", choices=["small", "medium", "large"], default="medium")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Repetitions for whole-batch stages")
+    arg_parser.add_argument("--corpus-dir", default=None, help="Keep the generated corpus here instead of a temp dir")
+    arg_parser.add_argument("--output", default="bench_results.json")
+    arg_parser.add_argument("--compare", default=None, help="Previous results file to diff against")
+    args = arg_parser.parse_args(argv)
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = write_corpus(args.corpus_dir or tmp_dir, args.count, formats, args.size, args.seed)
+        job_description = Path(corpus["job_descriptions"][0]).read_text(encoding="utf-8")
+        stages = run_benchmarks(corpus["resumes"], job_description, args.repeat)
+
+    results = {
+        "config": {"count": args.count, "formats": formats, "size": args.size, "seed": args.seed, "repeat": args.repeat},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "stages": stages,
+    }
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    for stage, stats in stages.items():
+        print(f"{stage:22s} {stats['throughput_per_s']:12.1f}/s  p50 {stats['p50_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms  process peak rss {stats['process_peak_rss_mb']:.0f} MB")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print("\n".join(compare(results, baseline)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "skill-sync" / "parse_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    key TEXT PRIMARY KEY,
+    raw_text TEXT NOT NULL,
+    parsed TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+def content_key(data: bytes, version: str) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{version}:{digest}"
+
+class ParseCache:
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_CACHE_PATH,
+        max_memory_entries: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT raw_text, parsed FROM parse_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE parse_cache SET accessed = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._conn.commit()
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+                    self.disk_hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    def put(self, key: str, raw_text: str, parsed: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remember(key, (raw_text, parsed))
+            if self._conn is None:
+                return
+            payload = json.dumps(parsed, ensure_ascii=False)
+            size = len(raw_text.encode("utf-8")) + len(payload.encode("utf-8"))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, raw_text, parsed, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, raw_text, payload, size, time.time()),
+            )
+            self._evict_disk()
+            self._conn.commit()
+
+    def _remember(self, key: str, entry: Tuple[str, Dict[str, Any]]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM parse_cache ORDER BY accessed ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM parse_cache WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM parse_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            disk_entries = disk_bytes = 0
+            if self._conn is not None:
+                disk_entries, disk_bytes = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache"
+                ).fetchone()
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,212 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from scorer import COMPONENTS, rank_order
+from skills import get_taxonomy
+
+_SCORE_FIELDS = tuple(f"{key}_score" for key in COMPONENTS)
+
+# Keys of a candidate as a dict: those screen_resumes used to return, in
+# their order, plus the near-duplicates collapsed into it
+CANDIDATE_KEYS = (
+    "name", "skills_score", "matched_required", "missing_required", "matched_preferred", "missing_preferred",
+    "experience_score", "candidate_years", "required_range", "education_score", "required_degree",
+    "semantic_score", "total_score", "weights", "rank", "duplicates",
+)
+
+class CandidateRecord:
+    # Skill sets are bitmasks over the taxonomy vocabulary. The requirement
+    # masks, range, degree and weights are shared by every record of a run, so
+    # each record only pays for its own name, scores and skills mask.
+    __slots__ = (
+        "name", "skills_score", "experience_score", "education_score", "semantic_score", "total_score",
+        "candidate_years", "skills_mask", "required_mask", "preferred_mask", "required_range",
+        "required_degree", "weights", "rank", "duplicates",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        skills_score: float,
+        experience_score: float,
+        education_score: float,
+        semantic_score: float,
+        total_score: float,
+        candidate_years: float,
+        skills_mask: int,
+        required_mask: int,
+        preferred_mask: int,
+        required_range: str,
+        required_degree: str,
+        weights: Dict[str, float],
+        rank: Optional[int] = None,
+        duplicates: Sequence[str] = (),
+    ):
+        self.name = name
+        self.skills_score = skills_score
+        self.experience_score = experience_score
+        self.education_score = education_score
+        self.semantic_score = semantic_score
+        self.total_score = total_score
+        self.candidate_years = candidate_years
+        self.skills_mask = skills_mask
+        self.required_mask = required_mask
+        self.preferred_mask = preferred_mask
+        self.required_range = required_range
+        self.required_degree = required_degree
+        self.weights = weights
+        self.rank = rank
+        self.duplicates = duplicates
+
+    @property
+    def matched_required(self) -> List[str]:
+        return get_taxonomy().skills_from_mask(self.skills_mask & self.required_mask)
+
+    @property
+    def missing_required(self) -> List[str]:
+        return get_taxonomy().skills_from_mask(self.required_mask & ~self.skills_mask)
+
+    @property
+    def matched_preferred(self) -> List[str]:
+        return get_taxonomy().skills_from_mask(self.skills_mask & self.preferred_mask)
+
+    @property
+    def missing_preferred(self) -> List[str]:
+        return get_taxonomy().skills_from_mask(self.preferred_mask & ~self.skills_mask)
+
+    # Mapping adapters so code written against the old candidate dicts
+    # (generate_explanation, rank_candidates, the Streamlit tables) keeps working
+    def __getitem__(self, key: str) -> Any:
+        if key not in CANDIDATE_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in CANDIDATE_KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in CANDIDATE_KEYS else default
+
+    def keys(self) -> Sequence[str]:
+        return CANDIDATE_KEYS
+
+    def to_dict(self) -> Dict[str, Any]:
+        candidate = {key: getattr(self, key) for key in CANDIDATE_KEYS}
+        candidate["weights"] = dict(self.weights)
+        candidate["duplicates"] = list(self.duplicates)
+        if self.rank is None:
+            del candidate["rank"]
+        return candidate
+
+    @classmethod
+    def from_dict(cls, candidate: Dict[str, Any]) -> "CandidateRecord":
+        taxonomy = get_taxonomy()
+        matched_required = candidate.get("matched_required", [])
+        matched_preferred = candidate.get("matched_preferred", [])
+        return cls(
+            name=candidate["name"],
+            skills_score=candidate.get("skills_score", 0.0),
+            experience_score=candidate.get("experience_score", 0.0),
+            education_score=candidate.get("education_score", 0.0),
+            semantic_score=candidate.get("semantic_score", 0.0),
+            total_score=candidate.get("total_score", 0.0),
+            candidate_years=candidate.get("candidate_years", 0),
+            skills_mask=taxonomy.skill_mask([*matched_required, *matched_preferred]),
+            required_mask=taxonomy.skill_mask([*matched_required, *candidate.get("missing_required", [])]),
+            preferred_mask=taxonomy.skill_mask([*matched_preferred, *candidate.get("missing_preferred", [])]),
+            required_range=candidate.get("required_range", ""),
+            required_degree=candidate.get("required_degree", ""),
+            weights=candidate.get("weights") or {},
+            rank=candidate.get("rank"),
+            duplicates=candidate.get("duplicates", ()),
+        )
+
+def mask_to_words(mask: int, n_words: int) -> np.ndarray:
+    return np.frombuffer(mask.to_bytes(n_words * 8, "little"), dtype="<u8")
+
+def words_to_mask(words: np.ndarray) -> int:
+    return int.from_bytes(np.ascontiguousarray(words, dtype="<u8").tobytes(), "little")
+
+def masks_to_words(masks: Sequence[int]) -> np.ndarray:
+    n_words = max(1, -(-len(get_taxonomy().vocabulary) // 64))
+    words = np.zeros((len(masks), n_words), dtype="<u8")
+    for i, mask in enumerate(masks):
+        words[i] = mask_to_words(mask, n_words)
+    return words
+
+def candidate_dtype(n_words: int) -> np.dtype:
+    return np.dtype([
+        ("name", object),
+        *((field, np.float64) for field in _SCORE_FIELDS),
+        ("total_score", np.float64),
+        ("candidate_years", np.float64),
+        ("skills", "<u8", (n_words,)),
+    ])
+
+class CandidatePool:
+    # Bulk form for large pools: one structured array row per candidate plus
+    # the requirements every row shares. Rows are materialised as
+    # CandidateRecord only when a caller asks for them.
+    def __init__(
+        self,
+        data: np.ndarray,
+        required_mask: int,
+        preferred_mask: int,
+        required_range: str,
+        required_degree: str,
+        weights: Dict[str, float],
+    ):
+        self.data = data
+        self.required_mask = required_mask
+        self.preferred_mask = preferred_mask
+        self.required_range = required_range
+        self.required_degree = required_degree
+        self.weights = weights
+
+    @classmethod
+    def from_records(cls, records: Sequence[CandidateRecord]) -> "CandidatePool":
+        if not records:
+            raise ValueError("Cannot build a pool from no records")
+        first = records[0]
+        words = masks_to_words([record.skills_mask for record in records])
+        data = np.zeros(len(records), dtype=candidate_dtype(words.shape[1]))
+        data["name"] = [record.name for record in records]
+        for field in (*_SCORE_FIELDS, "total_score", "candidate_years"):
+            data[field] = [getattr(record, field) for record in records]
+        data["skills"] = words
+        return cls(data, first.required_mask, first.preferred_mask, first.required_range, first.required_degree, first.weights)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def record(self, index: int, rank: Optional[int] = None) -> CandidateRecord:
+        row = self.data[index]
+        return CandidateRecord(
+            name=row["name"],
+            skills_score=float(row["skills_score"]),
+            experience_score=float(row["experience_score"]),
+            education_score=float(row["education_score"]),
+            semantic_score=float(row["semantic_score"]),
+            total_score=float(row["total_score"]),
+            candidate_years=row["candidate_years"].item(),
+            skills_mask=words_to_mask(row["skills"]),
+            required_mask=self.required_mask,
+            preferred_mask=self.preferred_mask,
+            required_range=self.required_range,
+            required_degree=self.required_degree,
+            weights=self.weights,
+            rank=rank,
+        )
+
+    def __iter__(self) -> Iterator[CandidateRecord]:
+        for i in range(len(self.data)):
+            yield self.record(i)
+
+    def ranked(self, top_k: Optional[int] = None) -> List[CandidateRecord]:
+        return [self.record(int(i), rank) for rank, i in enumerate(rank_order(self.data["total_score"], top_k), start=1)]
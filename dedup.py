@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import profiling
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32
+SHINGLE_SIZE = 3
+DEFAULT_DEDUP_PATH = Path.home() / ".cache" / "skill-sync" / "dedup"
+# Bumped when what a stored key means changes; older indexes are not loaded
+INDEX_VERSION = 2
+
+_WORD_REGEX = re.compile(r"\w+")
+_MERGE_TAIL = 4096
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    # splitmix64 finaliser; uint64 arithmetic wraps, which is what we want
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def _token_hashes(text: str) -> np.ndarray:
+    tokens = _WORD_REGEX.findall(text.lower())
+    vocab = {}
+    ids = np.array([vocab.setdefault(token, len(vocab)) for token in tokens], dtype=np.int64)
+    digests = b"".join(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest() for token in vocab)
+    return np.frombuffer(digests, dtype="<u8")[ids] if tokens else np.empty(0, dtype=np.uint64)
+
+def text_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def _write_atomic(target: Path, write: Callable[[BinaryIO], None]) -> None:
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    hashes = _token_hashes(text)
+    if hashes.shape[0] == 0:
+        return hashes
+    size = min(size, hashes.shape[0])
+    count = hashes.shape[0] - size + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(size):
+            shingles = _mix(shingles ^ hashes[offset:offset + count])
+    return np.unique(shingles)
+
+class DuplicateIndex:
+    # MinHash signatures of cluster representatives with banded LSH lookup.
+    # Band keys live in one sorted uint64 array plus a small dict of recent
+    # inserts, so the resident cost is the signatures (num_perm * 4 bytes per
+    # cluster) and 12 bytes per band entry. Clusters are keyed by a hash of
+    # the representative's text, never by filename, since names repeat across
+    # sessions. The threshold only applies when verifying candidates, so it
+    # can change per call without rebuilding the index.
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = Path(path) if path is not None else None
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        self.keys: List[str] = []
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._sorted_keys = np.empty(0, dtype=np.uint64)
+        self._sorted_rows = np.empty(0, dtype=np.int32)
+        self._tail: Dict[int, List[int]] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and (self.path / "meta.json").exists():
+            self._load()
+        self._perm_seeds = _mix(np.arange(1, self.num_perm + 1, dtype=np.uint64) * np.uint64(self.seed))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @profiling.instrument("dedup.signature")
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        shingles = shingle_hashes(text)
+        if shingles.shape[0] == 0:
+            return None
+        with np.errstate(over="ignore"):
+            hashed = _mix(shingles[:, None] ^ self._perm_seeds[None, :])
+        return (hashed.min(axis=0) >> np.uint64(32)).astype(np.uint32)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        # (..., num_perm) signatures -> (..., bands) keys, band number mixed in
+        rows = signatures.reshape(*signatures.shape[:-1], self.bands, -1).astype(np.uint64)
+        keys = np.broadcast_to(np.arange(self.bands, dtype=np.uint64), rows.shape[:-1])
+        with np.errstate(over="ignore"):
+            for column in range(rows.shape[-1]):
+                keys = _mix(keys ^ rows[..., column])
+        return keys
+
+    def _candidates(self, band_keys: np.ndarray) -> np.ndarray:
+        lo = np.searchsorted(self._sorted_keys, band_keys, side="left")
+        hi = np.searchsorted(self._sorted_keys, band_keys, side="right")
+        found = [self._sorted_rows[a:b] for a, b in zip(lo, hi) if b > a]
+        for band_key in band_keys.tolist():
+            if band_key in self._tail:
+                found.append(np.asarray(self._tail[band_key], dtype=np.int32))
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int32)
+
+    def find(self, signature: Optional[np.ndarray], threshold: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        if signature is None or not self.keys:
+            return None
+        candidates = self._candidates(self._band_keys(signature))
+        if candidates.shape[0] == 0:
+            return None
+        similarity = (self._signatures[candidates] == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        if similarity[best] < (self.threshold if threshold is None else threshold):
+            return None
+        return self.keys[candidates[best]], float(similarity[best])
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        row = len(self.keys)
+        if row == self._signatures.shape[0]:
+            grown = np.zeros((max(1024, row * 2), self.num_perm), dtype=np.uint32)
+            grown[:row] = self._signatures
+            self._signatures = grown
+        self._signatures[row] = signature
+        self.keys.append(key)
+        for band_key in self._band_keys(signature).tolist():
+            self._tail.setdefault(band_key, []).append(row)
+        if len(self._tail) >= _MERGE_TAIL:
+            self._merge_tail()
+
+    def _merge_tail(self, keys: Optional[np.ndarray] = None, rows: Optional[np.ndarray] = None) -> None:
+        if keys is None:
+            pairs = [(band_key, row) for band_key, tail_rows in self._tail.items() for row in tail_rows]
+            keys = np.array([band_key for band_key, _ in pairs], dtype=np.uint64)
+            rows = np.array([row for _, row in pairs], dtype=np.int32)
+        keys = np.concatenate([self._sorted_keys, keys])
+        rows = np.concatenate([self._sorted_rows, rows])
+        order = np.argsort(keys, kind="stable")
+        self._sorted_keys, self._sorted_rows = keys[order], rows[order]
+        self._tail = {}
+
+    def assign(self, text: str, threshold: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        # Returns the key of the cluster this text belongs to, registering the
+        # text as a new representative when nothing is similar enough. Text
+        # without any words has no signature and belongs to no cluster.
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            match = self.find(signature, threshold)
+            if match is not None:
+                return match
+            key = text_key(text)
+            self.add(key, signature)
+        return key, 1.0
+
+    def save(self, path: Optional[str] = None) -> None:
+        # Each file goes to its own temp file and is swapped in under the
+        # lock, signatures first, so concurrent saves never interleave their
+        # writes. A reader can still see one file swapped and not the other,
+        # which _load checks for.
+        directory = Path(path) if path is not None else self.path
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            signatures = self._signatures[:len(self.keys)]
+            meta = {"version": INDEX_VERSION, "num_perm": self.num_perm, "bands": self.bands, "seed": self.seed, "keys": list(self.keys)}
+            _write_atomic(directory / "signatures.npy", lambda f: np.save(f, signatures))
+            _write_atomic(directory / "meta.json", lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8")))
+
+    def _load(self) -> None:
+        try:
+            meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("version") != INDEX_VERSION:
+                # Older indexes keyed clusters by filename; start over and let
+                # the index refill as resumes come in
+                return
+            keys = list(meta["keys"])
+            num_perm, bands = meta["num_perm"], meta["bands"]
+            signatures = np.load(self.path / "signatures.npy")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+        # save() swaps signatures in before meta and clusters are only ever
+        # appended, so extra rows belong to a newer save; fewer rows or another
+        # width mean the files don't go together and the index starts empty
+        if signatures.ndim != 2 or signatures.shape[0] < len(keys) or signatures.shape[1] != num_perm or num_perm % bands:
+            return
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = meta["seed"]
+        self.keys = keys
+        self._signatures = signatures[:len(keys)].astype(np.uint32, copy=False)
+        self._merge_tail(self._band_keys(self._signatures).ravel(), np.repeat(np.arange(len(self.keys), dtype=np.int32), self.bands))
@@ -1,9 +1,19 @@
+from typing import TYPE_CHECKING
+
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
 
-_vectorizer: TfidfVectorizer | None = None
+import profiling
+
+# scikit-learn and scipy are imported inside the functions that need them so
+# importing this module stays cheap for the CLI and Streamlit cold starts
+if TYPE_CHECKING:
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+_vectorizer: "TfidfVectorizer | None" = None
 
-def _ensure_vectorizer(text: str) -> TfidfVectorizer:
+def _ensure_vectorizer(text: str) -> "TfidfVectorizer":
+    from sklearn.feature_extraction.text import TfidfVectorizer
     global _vectorizer
     if _vectorizer is None:
         _vectorizer = TfidfVectorizer()
@@ -24,6 +34,7 @@ def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     return float(np.dot(vec1, vec2) / (norm1 * norm2))
 
 def batch_embeddings(texts: list[str]) -> np.ndarray:
+    from sklearn.feature_extraction.text import TfidfVectorizer
     global _vectorizer
     if _vectorizer is None:
         _vectorizer = TfidfVectorizer()
@@ -32,3 +43,63 @@ def batch_embeddings(texts: list[str]) -> np.ndarray:
         _vectorizer.fit(texts)
     mat = _vectorizer.transform(texts)
     return np.asarray(mat.todense(), dtype=np.float32)
+
+def _fit_normalized(texts: list[str]) -> "sparse.csr_matrix":
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+    try:
+        matrix = TfidfVectorizer().fit_transform(texts)
+    except ValueError:
+        return sparse.csr_matrix((len(texts), 0), dtype=np.float32)
+    return normalize(matrix.tocsr().astype(np.float32), norm="l2", copy=False)
+
+def fit_corpus(job_description: str, resume_texts: list[str]) -> "sparse.csr_matrix":
+    return _fit_normalized([job_description, *resume_texts])
+
+@profiling.instrument("embeddings.semantic_scores")
+def semantic_scores(job_description: str, resume_texts: list[str]) -> np.ndarray:
+    matrix = fit_corpus(job_description, resume_texts)
+    job_vec = matrix[0].T
+    scores = matrix[1:] @ job_vec
+    return np.asarray(scores.toarray(), dtype=np.float32).ravel()
+
+@profiling.instrument("embeddings.semantic_score_matrix")
+def semantic_score_matrix(job_descriptions: list[str], resume_texts: list[str]) -> np.ndarray:
+    # One vocabulary for every JD and resume, then a single sparse
+    # resume-by-JD product gives the full N x M cosine matrix
+    matrix = _fit_normalized([*job_descriptions, *resume_texts])
+    jobs = matrix[:len(job_descriptions)]
+    resumes = matrix[len(job_descriptions):]
+    return np.asarray((resumes @ jobs.T).toarray(), dtype=np.float32)
+
+class StreamingSemanticScorer:
+    # Hashed TF-IDF with document frequencies accumulated in a fixed-size array,
+    # so a corpus of any size can be observed in one pass and scored in a second
+    # without holding the texts or a fitted vocabulary in memory
+    def __init__(self, job_description: str, n_features: int = 2 ** 18):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self._hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        self._df = np.zeros(n_features, dtype=np.int64)
+        self._n_docs = 0
+        self._job_counts = self._hasher.transform([job_description])
+        self.observe(job_description)
+
+    @profiling.instrument("embeddings.observe")
+    def observe(self, text: str) -> None:
+        counts = self._hasher.transform([text])
+        self._df[counts.indices] += 1
+        self._n_docs += 1
+
+    def _tfidf(self, counts: "sparse.csr_matrix") -> "sparse.csr_matrix":
+        from sklearn.preprocessing import normalize
+        idf = np.log((1 + self._n_docs) / (1 + self._df[counts.indices])) + 1.0
+        weighted = counts.copy().astype(np.float32)
+        weighted.data *= idf.astype(np.float32)
+        return normalize(weighted, norm="l2", copy=False)
+
+    @profiling.instrument("embeddings.score")
+    def score(self, text: str) -> float:
+        job_vec = self._tfidf(self._job_counts)
+        doc_vec = self._tfidf(self._hasher.transform([text]))
+        return float((doc_vec @ job_vec.T).sum())
@@ -1,12 +1,20 @@
 from typing import Dict, Any
 
+import profiling
+from scorer import WEIGHTS
+
+@profiling.instrument("explainer.generate_explanation")
 def generate_explanation(candidate: Dict[str, Any]) -> str:
+    weights = candidate.get('weights') or WEIGHTS
     lines = []
     lines.append(f"Candidate: {candidate.get('name', 'N/A')}")
     lines.append(f"Overall Score: {candidate.get('total_score', 0) * 100:.1f}/100 (Rank #{candidate.get('rank')})")
+    duplicates = candidate.get('duplicates', [])
+    if duplicates:
+        lines.append(f"Near-duplicate submissions: {', '.join(duplicates)}")
     lines.append("")
     skills = candidate.get('skills_score', 0) * 100
-    lines.append(f"✓ Skills Match: {skills:.1f}% (Weight 40%)")
+    lines.append(f"✓ Skills Match: {skills:.1f}% (Weight {weights.get('skills', 0) * 100:.0f}%)")
     matched_req = candidate.get('matched_required', [])
     missing_req = candidate.get('missing_required', [])
     
@@ -21,17 +29,17 @@ def generate_explanation(candidate: Dict[str, Any]) -> str:
         lines.append(f"  - Missing Preferred: {', '.join(missing_pref) if missing_pref else 'No missing skills'}")
     lines.append("")
     exp_score = candidate.get('experience_score', 0) * 100
-    lines.append(f"✓ Experience Match: {exp_score:.1f}% (Weight 25%)")
+    lines.append(f"✓ Experience Match: {exp_score:.1f}% (Weight {weights.get('experience', 0) * 100:.0f}%)")
     lines.append(f"  - Candidate years: {candidate.get('candidate_years', 0)}")
     lines.append(f"  - Required range: {candidate.get('required_range', 'N/A')}")
     lines.append("")
     edu_score = candidate.get('education_score', 0) * 100
-    lines.append(f"✓ Education Match: {edu_score:.1f}% (Weight 15%)")
+    lines.append(f"✓ Education Match: {edu_score:.1f}% (Weight {weights.get('education', 0) * 100:.0f}%)")
     lines.append(f"  - Required degree: {candidate.get('required_degree', 'N/A')}")
     lines.append(f"  - Matched: {'Yes' if candidate.get('education_score', 0) > 0 else 'No'}")
     lines.append("")
     sem_score = candidate.get('semantic_score', 0) * 100
-    lines.append(f"✓ Semantic Similarity: {sem_score:.1f}% (Weight 20%)")
+    lines.append(f"✓ Semantic Similarity: {sem_score:.1f}% (Weight {weights.get('semantic', 0) * 100:.0f}%)")
     lines.append("")
     lines.append("Recommendations:")
     missing = candidate.get('missing_required', [])
@@ -1,25 +1,19 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 
-_SKILL_KEYWORDS = {
-    "python", "java", "javascript", "c++", "c#", "react", "angular", "vue",
-    "node.js", "django", "flask", "sql", "mongodb", "postgresql", "aws",
-    "azure", "docker", "kubernetes", "git", "agile", "scrum",
-}
+import numpy as np
 
-_SKILL_SYNONYMS = {
-    "js": "javascript",
-    "reactjs": "react",
-    "nodejs": "node.js",
-    "aws": "aws",
-    "docker": "docker",
-    "kubernetes": "kubernetes",
-}
+import profiling
+from skills import get_taxonomy
+
+_SKILL_KEYWORDS = get_taxonomy().canonical
+
+_SKILL_SYNONYMS = get_taxonomy().aliases
 
 def _normalize_skill(skill: str) -> str:
-    s = skill.lower()
-    return _SKILL_SYNONYMS.get(s, s)
+    return get_taxonomy().normalize(skill)
 
+@profiling.instrument("matcher.skills_match")
 def calculate_skills_match(candidate_skills: List[str], required_skills: List[str], preferred_skills: List[str] = None) -> Dict[str, Any]:
     if preferred_skills is None:
         preferred_skills = []
@@ -53,6 +47,7 @@ def _parse_years_range(range_str: str) -> (int, int):
     val = int(parts[0].strip())
     return val, val
 
+@profiling.instrument("matcher.experience_match")
 def calculate_experience_match(candidate_years: float, required_range: str) -> Dict[str, Any]:
     min_req, max_req = _parse_years_range(required_range)
     if min_req <= candidate_years <= max_req:
@@ -69,6 +64,7 @@ def calculate_experience_match(candidate_years: float, required_range: str) -> D
         "required_range": required_range,
     }
 
+@profiling.instrument("matcher.education_match")
 def calculate_education_match(candidate_edu: List[Dict[str, str]], required_degree: str) -> Dict[str, Any]:
     required = required_degree.lower()
     matched = any(required in (edu.get("degree", "").lower()) for edu in candidate_edu)
@@ -77,3 +73,47 @@ def calculate_education_match(candidate_edu: List[Dict[str, str]], required_degr
         "required_degree": required_degree,
         "matched": matched,
     }
+
+@profiling.instrument("matcher.skills_match_matrix")
+def skills_match_matrix(candidate_skills: Sequence[List[str]], required_skills: Sequence[List[str]]) -> np.ndarray:
+    # N candidates x M skill lists; same scoring as calculate_skills_match with
+    # no preferred skills, computed as one binary matrix product
+    vocab: Dict[str, int] = {}
+    req_sets = [{_normalize_skill(s) for s in skills} for skills in required_skills]
+    for req_set in req_sets:
+        for skill in req_set:
+            vocab.setdefault(skill, len(vocab))
+    cand = np.zeros((len(candidate_skills), len(vocab)), dtype=np.float64)
+    for i, skills in enumerate(candidate_skills):
+        cols = [vocab[skill] for skill in {_normalize_skill(s) for s in skills} if skill in vocab]
+        cand[i, cols] = 1.0
+    req = np.zeros((len(vocab), len(req_sets)), dtype=np.float64)
+    for j, req_set in enumerate(req_sets):
+        req[[vocab[skill] for skill in req_set], j] = 1.0
+    matched = cand @ req
+    req_counts = req.sum(axis=0)
+    req_match_pct = np.where(req_counts > 0, matched / np.maximum(req_counts, 1.0), 1.0)
+    return req_match_pct * 0.8 + 1.0 * 0.2
+
+@profiling.instrument("matcher.experience_match_matrix")
+def experience_match_matrix(candidate_years: Sequence[float], required_ranges: Sequence[str]) -> np.ndarray:
+    years = np.asarray(candidate_years, dtype=np.float64)[:, None]
+    bounds = np.array([_parse_years_range(r) for r in required_ranges], dtype=np.float64).reshape(-1, 2)
+    min_req, max_req = bounds[:, 0][None, :], bounds[:, 1][None, :]
+    below = np.maximum(0.0, 1.0 - ((min_req - years) * 0.20))
+    above = np.maximum(0.70, 1.0 - ((years - max_req) * 0.05))
+    return np.where((years >= min_req) & (years <= max_req), 1.0, np.where(years < min_req, below, above))
+
+@profiling.instrument("matcher.education_match_matrix")
+def education_match_matrix(candidate_edu: Sequence[List[Dict[str, str]]], required_degrees: Sequence[str]) -> np.ndarray:
+    scores = np.zeros((len(candidate_edu), len(required_degrees)), dtype=np.float64)
+    columns: Dict[str, np.ndarray] = {}
+    for j, degree in enumerate(required_degrees):
+        required = degree.lower()
+        if required not in columns:
+            columns[required] = np.array(
+                [any(required in edu.get("degree", "").lower() for edu in edus) for edus in candidate_edu],
+                dtype=np.float64,
+            )
+        scores[:, j] = columns[required]
+    return scores
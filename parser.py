@@ -1,153 +1,335 @@
+import hashlib
+import importlib
+import io
+import os
 import re
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Any
-
-import pdfplumber
-import PyPDF2
-import docx
-try:
-    import spacy
-    _nlp = spacy.load("en_core_web_sm")
-except Exception:
-    _nlp = None
-
-def _extract_text_from_pdf(file_path: Path) -> str:
+from typing import List, Dict, Any, BinaryIO, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+import profiling
+from cache import ParseCache, content_key
+from segmenter import Segmentation, Segmenter, segment
+from skills import find_skills, get_taxonomy
+
+DEFAULT_NLP_BATCH_SIZE = 16
+
+def _load_nlp():
     try:
-        with pdfplumber.open(file_path) as pdf:
-            return "\n".join(page.extract_text() or "" for page in pdf.pages)
+        import spacy
+        nlp = spacy.load("en_core_web_sm")
     except Exception:
-        reader = PyPDF2.PdfReader(str(file_path))
-        return "\n".join(page.extract_text() or "" for page in reader.pages)
+        return None
+    # Only entity spans are used; en_core_web_sm's NER carries its own tok2vec,
+    # so the tagger, parser, lemmatizer and shared tok2vec can all be skipped
+    nlp.select_pipes(enable=["ner"])
+    return nlp
+
+# spaCy and the document libraries are imported on first use, so importing
+# this module (or screening a batch of .txt files) never pays for them
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                _nlp = _load_nlp()
+                _nlp_loaded = True
+    return _nlp
+
+_FORMAT_MODULES = {
+    ".pdf": ("pdfplumber", "PyPDF2"),
+    ".docx": ("docx",),
+    ".doc": ("docx",),
+}
+
+def warm_up(formats: Iterable[str] = (), background: bool = False) -> Optional[threading.Thread]:
+    def _run() -> None:
+        get_nlp()
+        for ext in formats:
+            for module in _FORMAT_MODULES.get(ext.lower(), ()):
+                importlib.import_module(module)
+    if not background:
+        _run()
+        return None
+    thread = threading.Thread(target=_run, name="skillsync-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+PARSER_VERSION = "5"
+
+TextSource = Union[str, Path, bytes, BinaryIO]
+
+class ExtractionPolicy(NamedTuple):
+    # PDF backends are tried in order until one yields text. Pages stream
+    # into the segmenter and extraction stops at the first budget reached or
+    # once every stop_after section is complete. Limits are checked between
+    # pages, so one very slow page can still overrun time_limit; 0 or None
+    # disables a limit.
+    backends: Tuple[str, ...] = ("pypdf2", "pdfplumber")
+    max_pages: Optional[int] = 20
+    max_bytes: Optional[int] = 256 * 1024
+    time_limit: Optional[float] = 15.0
+    stop_after: Tuple[str, ...] = ("skills", "experience", "education")
+
+    def fingerprint(self) -> str:
+        # Everything but the time limit decides the extracted text
+        return json.dumps([list(self.backends), self.max_pages, self.max_bytes, list(self.stop_after)])
+
+DEFAULT_EXTRACTION_POLICY = ExtractionPolicy()
+
+class ExtractionReport(NamedTuple):
+    backend: str
+    pages: int
+    total_pages: int
+    stopped: str
+    seconds: float
+
+def _cache_version(policy: ExtractionPolicy) -> str:
+    # Skill lists depend on the taxonomy as well as on the parser code
+    version = f"{PARSER_VERSION}:{get_taxonomy().digest}"
+    if policy == DEFAULT_EXTRACTION_POLICY:
+        return version
+    return f"{version}:{hashlib.sha1(policy.fingerprint().encode('utf-8')).hexdigest()[:12]}"
+
+def _pypdf2_pages(stream: Union[Path, BinaryIO]) -> Iterator[Tuple[int, str]]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(stream)
+    total = len(reader.pages)
+    for page in reader.pages:
+        yield total, page.extract_text() or ""
 
-def _extract_text_from_docx(file_path: Path) -> str:
-    doc = docx.Document(str(file_path))
+def _pdfplumber_pages(stream: Union[Path, BinaryIO]) -> Iterator[Tuple[int, str]]:
+    import pdfplumber
+    with pdfplumber.open(stream) as pdf:
+        total = len(pdf.pages)
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            # Drops the page's cached layout objects before the next one
+            page.close()
+            yield total, text
+
+_PDF_BACKENDS = {"pypdf2": _pypdf2_pages, "pdfplumber": _pdfplumber_pages}
+
+def _extract_pdf_with(backend: str, stream: Union[Path, BinaryIO], policy: ExtractionPolicy, deadline: Optional[float]):
+    start = time.perf_counter()
+    segmenter = Segmenter()
+    pages = total = size = 0
+    stopped = ""
+    page_texts = _PDF_BACKENDS[backend](stream)
+    try:
+        for total, page_text in page_texts:
+            # Pages are joined with newlines, as one string used to be
+            segmenter.feed("\n" + page_text if pages else page_text)
+            pages += 1
+            size += len(page_text.encode("utf-8"))
+            if pages >= total:
+                continue
+            if policy.stop_after and segmenter.has_sections(policy.stop_after):
+                stopped = "sections"
+            elif policy.max_pages and pages >= policy.max_pages:
+                stopped = "max_pages"
+            elif policy.max_bytes and size >= policy.max_bytes:
+                stopped = "max_bytes"
+            elif deadline is not None and time.perf_counter() >= deadline:
+                stopped = "time_limit"
+            if stopped:
+                break
+    finally:
+        page_texts.close()
+    segments = segmenter.close()
+    return segments, ExtractionReport(backend, pages, total, stopped, time.perf_counter() - start)
+
+def _extract_pdf(stream: Union[Path, BinaryIO], name: str, policy: ExtractionPolicy) -> Tuple[Segmentation, ExtractionReport]:
+    unknown = [backend for backend in policy.backends if backend not in _PDF_BACKENDS]
+    if unknown or not policy.backends:
+        raise ValueError(f"Unknown PDF backends: {unknown or policy.backends}")
+    deadline = time.perf_counter() + policy.time_limit if policy.time_limit else None
+    result = None
+    error = None
+    for backend in policy.backends:
+        if result is not None and deadline is not None and time.perf_counter() >= deadline:
+            break
+        if not isinstance(stream, Path):
+            stream.seek(0)
+        try:
+            with profiling.timed(f"parser.extract.{backend}", name):
+                segments, report = _extract_pdf_with(backend, stream, policy, deadline)
+        except Exception as exc:
+            error = exc
+            continue
+        result = segments, report
+        # A PDF without a text layer gets the next backend, budget permitting
+        if segments.text.strip():
+            break
+    if result is None:
+        raise error
+    return result
+
+def _extract_text_from_docx(stream: Union[Path, BinaryIO]) -> str:
+    import docx
+    doc = docx.Document(str(stream) if isinstance(stream, Path) else stream)
     return "\n".join(p.text for p in doc.paragraphs)
 
-def _extract_text_from_txt(file_path: Path) -> str:
-    return file_path.read_text(encoding="utf-8")
-
-def extract_text(file_path: str) -> str:
-    path = Path(file_path)
-    ext = path.suffix.lower()
-    if ext == ".pdf":
-        return _extract_text_from_pdf(path)
-    if ext in {".docx", ".doc"}:
-        return _extract_text_from_docx(path)
-    if ext == ".txt":
-        return _extract_text_from_txt(path)
+def _extract_text_from_txt(stream: Union[Path, BinaryIO]) -> str:
+    if isinstance(stream, Path):
+        return stream.read_text(encoding="utf-8")
+    return stream.read().decode("utf-8")
+
+Extraction = Tuple[str, ExtractionReport, Optional[Segmentation]]
+
+def extract_document(
+    source: TextSource,
+    filename: Optional[str] = None,
+    policy: Optional[ExtractionPolicy] = None,
+) -> Extraction:
+    # PDFs come back already segmented, since their pages were streamed
+    # through the segmenter to decide when to stop
+    if isinstance(source, (str, Path)):
+        stream = Path(source)
+        name = filename or stream.name
+    else:
+        stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        name = filename or getattr(source, "name", "")
+    ext = Path(name).suffix.lower()
+    with profiling.timed("parser.extract_text", name):
+        if ext == ".pdf":
+            segments, report = _extract_pdf(stream, name, policy or DEFAULT_EXTRACTION_POLICY)
+            return segments.text, report, segments
+        start = time.perf_counter()
+        if ext in {".docx", ".doc"}:
+            text = _extract_text_from_docx(stream)
+            return text, ExtractionReport("docx", 0, 0, "", time.perf_counter() - start), None
+        if ext == ".txt":
+            text = _extract_text_from_txt(stream)
+            return text, ExtractionReport("text", 0, 0, "", time.perf_counter() - start), None
     raise ValueError(f"Unsupported file type: {ext}")
 
-_EMAIL_REGEX = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
-_PHONE_REGEX = re.compile(r"(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4})")
-_LINKEDIN_REGEX = re.compile(r"linkedin\.com/in/[^\s/]+")
+def extract_text(source: TextSource, filename: Optional[str] = None, policy: Optional[ExtractionPolicy] = None) -> str:
+    return extract_document(source, filename, policy)[0]
 
-def extract_personal_info(text: str) -> Dict[str, str]:
-    email_match = _EMAIL_REGEX.search(text)
-    phone_match = _PHONE_REGEX.search(text)
-    linkedin_match = _LINKEDIN_REGEX.search(text)
+def _doc_for(text: str, doc):
+    if doc is None:
+        nlp = get_nlp()
+        if nlp is not None:
+            return nlp(text)
+    return doc
+
+def _first_entity(doc, label: str, start: int, end: int) -> str:
+    if doc is None:
+        return ""
+    span = doc.char_span(start, end, alignment_mode="expand")
+    if span is None:
+        return ""
+    for ent in span.ents:
+        if ent.label_ == label:
+            return ent.text
+    return ""
+
+# The extractors below read a Segmentation, so a resume is scanned once
+# however many of them run; called on plain text they segment it themselves
+
+def extract_personal_info(text: str, doc=None, segments: Optional[Segmentation] = None) -> Dict[str, str]:
+    segments = segments or segment(text)
     name = None
-    if _nlp:
-        doc = _nlp(text)
+    doc = _doc_for(text, doc)
+    if doc is not None:
         for ent in doc.ents:
             if ent.label_ == "PERSON":
                 name = ent.text.strip()
                 break
     if not name:
-        first_lines = text.splitlines()[:5]
-        for line in first_lines:
+        for line in segments.lines[:5]:
             words = line.strip().split()
             if len(words) >= 2 and all(w[0].isupper() for w in words[:2]):
                 name = " ".join(words[:2])
                 break
     return {
         "name": name or "",
-        "email": email_match.group(0) if email_match else "",
-        "phone": phone_match.group(0) if phone_match else "",
-        "linkedin": linkedin_match.group(0) if linkedin_match else "",
+        "email": segments.contacts.get("email", ""),
+        "phone": segments.contacts.get("phone", ""),
+        "linkedin": segments.contacts.get("linkedin", ""),
     }
 
-_SKILL_KEYWORDS = {
-    "python", "java", "javascript", "c++", "c#", "react", "angular", "vue",
-    "node.js", "django", "flask", "sql", "mongodb", "postgresql", "aws",
-    "azure", "docker", "kubernetes", "git", "agile", "scrum",
-}
+def extract_skills(text: str, segments: Optional[Segmentation] = None) -> List[str]:
+    if segments is None:
+        return find_skills(text)
+    return get_taxonomy().find_tokens(segments.tokens)
 
-def extract_skills(text: str) -> List[str]:
-    tokens = {t.lower() for t in re.findall(r"[A-Za-z0-9#+.]+", text)}
-    found = _SKILL_KEYWORDS.intersection(tokens)
-    return sorted(found)
+# The lookahead lets the scan skip positions that cannot start a month name
+_DATE_REGEX = re.compile(r"(?=[ADFJMNOSadfjmnos])(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}", re.IGNORECASE)
+_TITLE_REGEX = re.compile(r"(Senior|Junior|Lead|Manager|Engineer|Developer|Analyst|Architect)", re.I)
 
-_DATE_REGEX = re.compile(r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}", re.IGNORECASE)
-
-def _parse_date_range(section: str) -> List[Dict[str, Any]]:
+def extract_experience(text: str, doc=None, segments: Optional[Segmentation] = None) -> List[Dict[str, Any]]:
+    segments = segments or segment(text)
+    sections = segments.sections_of("experience")
+    if not sections:
+        return []
+    doc = _doc_for(text, doc)
     experiences = []
-    lines = section.splitlines()
-    for line in lines:
-        dates = _DATE_REGEX.findall(line)
-        if len(dates) >= 2:
-            start, end = dates[0], dates[1]
-            company = ""
-            if _nlp:
-                doc = _nlp(line)
-                orgs = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
-                company = orgs[0] if orgs else ""
-            title_match = re.search(r"(Senior|Junior|Lead|Manager|Engineer|Developer|Analyst|Architect)", line, re.I)
-            title = title_match.group(0) if title_match else ""
+    for section in sections:
+        # One date scan per section; lines holding a start and end date are jobs
+        dates_by_line: Dict[int, List[str]] = {}
+        for match in _DATE_REGEX.finditer(segments.text, section.start, section.end):
+            if "\n" not in match.group(0):
+                dates_by_line.setdefault(segments.line_index(match.start()), []).append(match.group(1))
+        for index, dates in dates_by_line.items():
+            if len(dates) < 2:
+                continue
+            line_start, line = segments.line(index, section)
+            company = _first_entity(doc, "ORG", line_start, line_start + len(line))
+            title_match = _TITLE_REGEX.search(line)
             experiences.append({
-                "title": title,
+                "title": title_match.group(0) if title_match else "",
                 "company": company,
-                "start_date": start,
-                "end_date": end,
+                "start_date": dates[0],
+                "end_date": dates[1],
             })
     return experiences
 
-def extract_experience(text: str) -> List[Dict[str, Any]]:
-    exp_section_match = re.search(r"experience|work history|professional experience", text, re.I)
-    if not exp_section_match:
-        return []
-    start_idx = exp_section_match.end()
-    snippet = text[start_idx:start_idx + 2000]
-    return _parse_date_range(snippet)
-
 _DEGREE_REGEX = re.compile(r"(bachelor|master|ph\.d|doctor|associate)[^\n]*", re.I)
+_MAJOR_REGEX = re.compile(r"(?:in|of)\s+([A-Za-z &]+)", re.I)
 
-def extract_education(text: str) -> List[Dict[str, str]]:
-    edu_section_match = re.search(r"education|academic background", text, re.I)
-    if not edu_section_match:
+def extract_education(text: str, doc=None, segments: Optional[Segmentation] = None) -> List[Dict[str, str]]:
+    segments = segments or segment(text)
+    if not segments.sections_of("education"):
         return []
-    start = edu_section_match.end()
-    snippet = text[start:start + 1500]
-    lines = snippet.splitlines()
+    doc = _doc_for(text, doc)
     educations = []
-    for line in lines:
+    for line_start, line in segments.lines_of("education"):
         degree_match = _DEGREE_REGEX.search(line)
         if degree_match:
-            university = ""
-            if _nlp:
-                doc = _nlp(line)
-                orgs = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
-                university = orgs[0] if orgs else ""
+            university = _first_entity(doc, "ORG", line_start, line_start + len(line))
             degree = degree_match.group(0).strip()
-            major_match = re.search(r"(?:in|of)\s+([A-Za-z &]+)", line, re.I)
+            major_match = _MAJOR_REGEX.search(line)
             major = major_match.group(1).strip() if major_match else ""
             educations.append({"degree": degree, "major": major, "university": university})
     return educations
 
-def parse_resume(file_path: str) -> Dict[str, Any]:
-    raw_text = extract_text(file_path)
-    personal = extract_personal_info(raw_text)
-    skills = extract_skills(raw_text)
-    experience = extract_experience(raw_text)
-    education = extract_education(raw_text)
+_MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+
+def _to_month_year(s: str) -> Tuple[int, int]:
+    parts = s.split()
+    if len(parts) < 2:
+        return 1, 2020
+    return _MONTHS.get(parts[0][:3].lower(), 1), int(parts[1])
+
+@profiling.instrument("parser.parse_text")
+def _parse_raw_text(raw_text: str, doc=None, segments: Optional[Segmentation] = None) -> Dict[str, Any]:
+    doc = _doc_for(raw_text, doc)
+    segments = segments or segment(raw_text)
+    personal = extract_personal_info(raw_text, doc, segments)
+    skills = extract_skills(raw_text, segments)
+    experience = extract_experience(raw_text, doc, segments)
+    education = extract_education(raw_text, doc, segments)
     total_months = 0
     for exp in experience:
-        month_map = {"jan":1,"feb":2,"mar":3,"apr":4,"may":5,"jun":6,"jul":7,"aug":8,"sep":9,"oct":10,"nov":11,"dec":12}
-        def _to_month_year(s):
-            parts = s.split()
-            if len(parts) < 2:
-                return 1, 2020
-            return month_map.get(parts[0][:3].lower(),1), int(parts[1])
         sm, sy = _to_month_year(exp["start_date"])
         em, ey = _to_month_year(exp["end_date"])
         months = (ey - sy) * 12 + (em - sm)
@@ -164,6 +346,268 @@ def parse_resume(file_path: str) -> Dict[str, Any]:
         "total_experience_years": total_years,
     }
 
+def _read_source(source: TextSource) -> bytes:
+    if isinstance(source, (str, Path)):
+        return Path(source).read_bytes()
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    return source.read()
+
+def parse_resume_with_text(
+    source: TextSource,
+    cache: Optional[ParseCache] = None,
+    filename: Optional[str] = None,
+    policy: Optional[ExtractionPolicy] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    policy = policy or DEFAULT_EXTRACTION_POLICY
+    if cache is None:
+        raw_text, _, segments = extract_document(source, filename, policy)
+        return raw_text, _parse_raw_text(raw_text, segments=segments)
+    if filename is None:
+        filename = str(source) if isinstance(source, (str, Path)) else getattr(source, "name", None)
+    data = _read_source(source)
+    key = content_key(data, _cache_version(policy))
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+    raw_text, report, segments = extract_document(data, filename, policy)
+    parsed = _parse_raw_text(raw_text, segments=segments)
+    # A time-limited extraction depends on machine load, so it is not cached
+    if report.stopped != "time_limit":
+        cache.put(key, raw_text, parsed)
+    return raw_text, parsed
+
+def parse_resume(
+    source: TextSource,
+    cache: Optional[ParseCache] = None,
+    filename: Optional[str] = None,
+    policy: Optional[ExtractionPolicy] = None,
+) -> Dict[str, Any]:
+    return parse_resume_with_text(source, cache, filename, policy)[1]
+
+ResumeSource = Union[str, Path, Tuple[str, bytes], BinaryIO]
+
+class ParseOutcome(NamedTuple):
+    index: int
+    name: str
+    raw_text: str
+    parsed: Optional[Dict[str, Any]]
+    error: Optional[str]
+    extraction: Optional[ExtractionReport] = None
+
+def _normalize_source(source: ResumeSource) -> Union[str, Path, Tuple[str, bytes]]:
+    if isinstance(source, (str, Path, tuple)):
+        return source
+    return (getattr(source, "name", ""), source.read())
+
+def _source_name(source: ResumeSource) -> str:
+    if isinstance(source, tuple):
+        return source[0]
+    return str(source)
+
+def _source_bytes(source: ResumeSource) -> bytes:
+    if isinstance(source, tuple):
+        return source[1]
+    return Path(source).read_bytes()
+
+def _init_worker() -> None:
+    get_nlp()
+
+class ParsePool(ProcessPoolExecutor):
+    # Keeps its size, which parse_resumes sizes its in-flight window by
+    def __init__(self, workers: int):
+        super().__init__(max_workers=workers, initializer=_init_worker)
+        self.workers = workers
+
+def create_parse_pool(workers: Optional[int] = None) -> ParsePool:
+    return ParsePool(workers or os.cpu_count() or 1)
+
+def _pipe_docs(texts: List[str], batch_size: int) -> List[Any]:
+    # One nlp.pipe call for the batch. If spaCy raises on any document the
+    # docs come back as None, and _parse_raw_text runs nlp on each text by
+    # itself, so only the document that breaks spaCy fails.
+    nlp = get_nlp()
+    if nlp is None:
+        return [None] * len(texts)
+    with profiling.timed("parser.nlp"):
+        try:
+            return list(nlp.pipe(texts, batch_size=batch_size))
+        except Exception:
+            return [None] * len(texts)
+
+def parse_texts(texts: List[str], batch_size: int = DEFAULT_NLP_BATCH_SIZE) -> List[Dict[str, Any]]:
+    return [_parse_raw_text(text, doc) for text, doc in zip(texts, _pipe_docs(texts, batch_size))]
+
+def _error_outcome(index: int, name: str, exc: Exception) -> ParseOutcome:
+    return ParseOutcome(index, name, "", None, f"{type(exc).__name__}: {exc}")
+
+def _parse_chunk(
+    items: List[Tuple[int, Union[str, Path, Tuple[str, bytes]]]],
+    batch_size: int,
+    policy: ExtractionPolicy = DEFAULT_EXTRACTION_POLICY,
+) -> List[ParseOutcome]:
+    outcomes = []
+    extracted = []
+    for index, source in items:
+        name = _source_name(source)
+        try:
+            if isinstance(source, tuple):
+                raw_text, report, segments = extract_document(source[1], name, policy)
+            else:
+                raw_text, report, segments = extract_document(source, policy=policy)
+        except Exception as exc:
+            outcomes.append(_error_outcome(index, name, exc))
+            continue
+        extracted.append((index, name, raw_text, report, segments))
+    parsed = parse_extracted([(raw_text, segments) for _, _, raw_text, _, segments in extracted], batch_size)
+    for (index, name, raw_text, report, _), (fields, error) in zip(extracted, parsed):
+        outcomes.append(ParseOutcome(index, name, raw_text, fields, error, report))
+    return outcomes
+
+def parse_extracted(
+    texts: List[Tuple[str, Optional[Segmentation]]],
+    batch_size: int = DEFAULT_NLP_BATCH_SIZE,
+) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    # Parses already extracted (and possibly segmented) texts with one
+    # nlp.pipe call for all of them. When it raises, every document is run
+    # through spaCy again inside its own try block below, so a resume that
+    # breaks spaCy fails itself rather than its chunk or the batch.
+    results = []
+    docs = _pipe_docs([raw_text for raw_text, _ in texts], batch_size)
+    for (raw_text, segments), doc in zip(texts, docs):
+        try:
+            results.append((_parse_raw_text(raw_text, doc, segments), None))
+        except Exception as exc:
+            results.append((None, f"{type(exc).__name__}: {exc}"))
+    return results
+
+def _parse_chunk_in_worker(items, batch_size: int, profile: bool, policy: ExtractionPolicy) -> Tuple[List[ParseOutcome], Optional[Dict[str, Any]]]:
+    # Timings recorded in a worker process are shipped back and merged into
+    # the parent's counters
+    return profiling.run_in_worker(profile, _parse_chunk, items, batch_size, policy)
+
+def parse_resumes(
+    paths_or_bytes: Iterable[ResumeSource],
+    workers: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    batch_size: int = DEFAULT_NLP_BATCH_SIZE,
+    pool: Optional[ProcessPoolExecutor] = None,
+    policy: Optional[ExtractionPolicy] = None,
+) -> Iterator[ParseOutcome]:
+    # Sources are consumed lazily so a directory walk of any size only keeps
+    # the in-flight window in memory. Cache hits are yielded as they are found,
+    # at most one window's worth at a time, so a fully cached directory never
+    # holds more outcomes than a cold one.
+    policy = policy or DEFAULT_EXTRACTION_POLICY
+    version = _cache_version(policy)
+    sources = enumerate(paths_or_bytes)
+    ready: List[ParseOutcome] = []
+    keys: Dict[int, str] = {}
+    exhausted = False
+
+    def _next_pending() -> Optional[Tuple[int, Union[str, Path, Tuple[str, bytes]]]]:
+        # None once the sources run out or ready holds a full window
+        nonlocal exhausted
+        while len(ready) < max_ready:
+            item = next(sources, None)
+            if item is None:
+                exhausted = True
+                return None
+            index, source = item
+            source = _normalize_source(source)
+            if cache is None:
+                return index, source
+            try:
+                key = content_key(_source_bytes(source), version)
+            except OSError as exc:
+                ready.append(_error_outcome(index, _source_name(source), exc))
+                continue
+            entry = cache.get(key)
+            if entry is not None:
+                ready.append(ParseOutcome(index, _source_name(source), entry[0], entry[1], None))
+                continue
+            keys[index] = key
+            return index, source
+        return None
+
+    def _next_chunk(size: int) -> List[Tuple[int, Union[str, Path, Tuple[str, bytes]]]]:
+        chunk = []
+        while len(chunk) < size:
+            item = _next_pending()
+            if item is None:
+                break
+            chunk.append(item)
+        return chunk
+
+    def _finish(outcome: ParseOutcome) -> ParseOutcome:
+        key = keys.pop(outcome.index, None)
+        timed_out = outcome.extraction is not None and outcome.extraction.stopped == "time_limit"
+        if cache is not None and key is not None and outcome.error is None and not timed_out:
+            cache.put(key, outcome.raw_text, outcome.parsed)
+        return outcome
+
+    if pool is not None:
+        # A long-lived pool from create_parse_pool keeps spaCy loaded between calls
+        workers = getattr(pool, "workers", None) or workers
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, batch_size)
+    if hasattr(paths_or_bytes, "__len__"):
+        total = len(paths_or_bytes)
+        if total == 0:
+            return
+        workers = min(workers, total)
+        # Small uploads are spread across every worker rather than packed into one chunk
+        chunk_size = max(1, min(chunk_size, -(-total // max(workers, 1))))
+    max_ready = max(1, workers) * 2 * chunk_size
+    if workers <= 1 and pool is None:
+        while True:
+            chunk = _next_chunk(chunk_size)
+            yield from ready
+            ready.clear()
+            if chunk:
+                for outcome in _parse_chunk(chunk, batch_size, policy):
+                    yield _finish(outcome)
+            elif exhausted:
+                return
+
+    profile = profiling.is_enabled()
+    own_pool = pool is None
+    if own_pool:
+        pool = create_parse_pool(workers)
+    try:
+        in_flight = {}
+
+        def _submit_next() -> bool:
+            chunk = _next_chunk(chunk_size)
+            if not chunk:
+                return False
+            in_flight[pool.submit(_parse_chunk_in_worker, chunk, batch_size, profile, policy)] = chunk
+            return True
+
+        while True:
+            while len(in_flight) < workers * 2 and _submit_next():
+                pass
+            yield from ready
+            ready.clear()
+            if not in_flight:
+                if exhausted:
+                    return
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = in_flight.pop(future)
+                try:
+                    outcomes, timings = future.result()
+                    if timings is not None:
+                        profiling.merge(timings)
+                except Exception as exc:
+                    outcomes = [_error_outcome(index, _source_name(source), exc) for index, source in chunk]
+                for outcome in outcomes:
+                    yield _finish(outcome)
+    finally:
+        if own_pool:
+            pool.shutdown()
+
 if __name__ == "__main__":
     import sys, json
     if len(sys.argv) != 2:
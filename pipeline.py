@@ -0,0 +1,413 @@
+import asyncio
+import contextvars
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import profiling
+from cache import ParseCache, content_key
+from dedup import DuplicateIndex
+from embeddings import StreamingSemanticScorer
+from parser import (
+    DEFAULT_EXTRACTION_POLICY, DEFAULT_NLP_BATCH_SIZE, ExtractionPolicy, ExtractionReport, ParseOutcome, ResumeSource,
+    _cache_version, _normalize_source, _source_name, create_parse_pool, extract_document, parse_extracted,
+)
+from scorer import calculate_total_score
+from screening import ScreeningSession, _candidate_name, build_requirements, score_parsed, session_from_outcomes
+from segmenter import Segmentation, segment
+
+STAGES = ("ingest", "extract", "dedup", "parse", "score")
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_INGEST_CONCURRENCY = 8
+
+class PipelineResult(NamedTuple):
+    outcome: ParseOutcome
+    # Scores against the documents seen so far; semantic_score and
+    # total_score are provisional until session_from_results refits TF-IDF
+    candidate: Optional[Dict[str, Any]]
+    duplicate_of: Optional[str]
+    # Duplicate-index cluster key, used to settle the final representative
+    cluster: Optional[str] = None
+
+class _Item:
+    __slots__ = (
+        "index", "name", "source", "data", "key", "raw_text", "extraction", "segments", "parsed", "error", "duplicate_of", "cluster",
+        "candidate",
+    )
+
+    def __init__(self, index: int, source: Any):
+        self.index = index
+        self.source = source
+        self.name = _source_name(source)
+        self.data: Optional[bytes] = None
+        self.key: Optional[str] = None
+        self.raw_text = ""
+        self.extraction: Optional[ExtractionReport] = None
+        self.segments: Optional[Segmentation] = None
+        self.parsed: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.duplicate_of: Optional[str] = None
+        self.cluster: Optional[str] = None
+        self.candidate: Optional[Dict[str, Any]] = None
+
+    def result(self) -> PipelineResult:
+        outcome = ParseOutcome(self.index, self.name, self.raw_text, self.parsed, self.error, self.extraction)
+        return PipelineResult(outcome, self.candidate, self.duplicate_of, self.cluster)
+
+class _StageStats:
+    __slots__ = ("inbox", "concurrency", "in_flight", "processed", "failed", "busy_s", "max_depth")
+
+    def __init__(self, inbox: asyncio.Queue, concurrency: int):
+        self.inbox = inbox
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_s = 0.0
+        self.max_depth = 0
+
+_DONE = object()
+
+def _read(source: Any) -> Tuple[str, bytes]:
+    if isinstance(source, tuple):
+        return source
+    return str(source), Path(source).read_bytes()
+
+def _extract(name: str, data: bytes, policy: ExtractionPolicy) -> Tuple[str, ExtractionReport, Segmentation]:
+    # Segmented here, while the text is at hand, so the parse stage does not
+    # segment it again
+    raw_text, report, segments = extract_document(data, name, policy)
+    return raw_text, report, segments or segment(raw_text)
+
+class ScreeningPipeline:
+    # Staged screening: ingest -> extract -> dedup -> parse -> score. Stages
+    # are connected by bounded asyncio queues and each runs `concurrency`
+    # workers; file reads, cache lookups and scoring go to threads, extraction
+    # and parsing to a process pool. A full queue blocks the stage feeding it,
+    # so resumes in memory are bounded by the queue sizes and concurrency,
+    # never by the number of sources. Results come out in completion order.
+    # Each parse worker takes whatever is queued, up to batch_size resumes,
+    # so spaCy sees them in one nlp.pipe call.
+    # With score=False the score stage is left out, for callers that only
+    # want parse outcomes and score them themselves.
+    def __init__(
+        self,
+        job_description: str,
+        cache: Optional[ParseCache] = None,
+        policy: Optional[ExtractionPolicy] = None,
+        dedup: Optional[DuplicateIndex] = None,
+        workers: Optional[int] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        executor: Optional[Executor] = None,
+        dedup_threshold: Optional[float] = None,
+        score: bool = True,
+        batch_size: int = DEFAULT_NLP_BATCH_SIZE,
+    ):
+        self.job_description = job_description
+        self.requirements = build_requirements(job_description)
+        self.cache = cache
+        self.policy = policy or DEFAULT_EXTRACTION_POLICY
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+        self.stages = STAGES if score else STAGES[:-1]
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = {
+            "ingest": DEFAULT_INGEST_CONCURRENCY,
+            "extract": self.workers,
+            "dedup": 1,
+            "parse": self.workers,
+            "score": 1,
+            **(concurrency or {}),
+        }
+        unknown = set(self.concurrency) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}")
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.executor = executor
+        self._stats: Dict[str, _StageStats] = {}
+        self._output: Optional[asyncio.Queue] = None
+        self._version = _cache_version(self.policy)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        # Read from other threads while a run is in progress; the values are
+        # plain ints and floats, so a slightly stale snapshot is the worst case
+        metrics = {}
+        for stage, stats in list(self._stats.items()):
+            metrics[stage] = {
+                "queue_depth": stats.inbox.qsize(),
+                "max_queue_depth": stats.max_depth,
+                "concurrency": stats.concurrency,
+                "in_flight": stats.in_flight,
+                "processed": stats.processed,
+                "failed": stats.failed,
+                "busy_s": stats.busy_s,
+            }
+        if self._output is not None:
+            metrics["output"] = {"queue_depth": self._output.qsize()}
+        return metrics
+
+    def to_prometheus(self, prefix: str = "skillsync") -> str:
+        lines = [f"# TYPE {prefix}_pipeline_queue_depth gauge"]
+        metrics = self.metrics()
+        lines += [f'{prefix}_pipeline_queue_depth{{stage="{stage}"}} {values["queue_depth"]}' for stage, values in metrics.items()]
+        lines.append(f"# TYPE {prefix}_pipeline_processed_total counter")
+        lines += [f'{prefix}_pipeline_processed_total{{stage="{stage}"}} {values["processed"]}'
+                  for stage, values in metrics.items() if "processed" in values]
+        return "\n".join(lines) + "\n"
+
+    async def _offload(self, func: Callable, *args) -> Any:
+        # Same timing hand-off as parse_resumes for worker processes; thread
+        # executors record straight into this run's collector, which
+        # run_in_executor would not carry over without the context copy
+        loop = asyncio.get_running_loop()
+        if not isinstance(self.executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(self.executor, contextvars.copy_context().run, func, *args)
+        result, timings = await loop.run_in_executor(self.executor, profiling.run_in_worker, profiling.is_enabled(), func, *args)
+        if timings is not None:
+            profiling.merge(timings)
+        return result
+
+    async def _ingest(self, item: _Item) -> None:
+        item.name, item.data = await asyncio.to_thread(_read, item.source)
+        item.source = None
+        if self.cache is not None:
+            item.key = content_key(item.data, self._version)
+            entry = await asyncio.to_thread(self.cache.get, item.key)
+            if entry is not None:
+                item.raw_text, item.parsed = entry
+                item.data = None
+
+    async def _extract(self, item: _Item) -> None:
+        if item.parsed is not None:
+            return
+        item.raw_text, item.extraction, item.segments = await self._offload(_extract, item.name, item.data, self.policy)
+        item.data = None
+
+    async def _dedup(self, item: _Item) -> None:
+        if self.dedup is None:
+            return
+        # A member skips parsing when a lower-indexed member of its cluster
+        # got here first. Arrival order varies from run to run, so one that
+        # arrives after a higher-indexed member is parsed as well, and
+        # session_from_results keeps the lowest-indexed parsed member.
+        match = await asyncio.to_thread(self.dedup.assign, item.raw_text, self.dedup_threshold)
+        if match is None:
+            return
+        item.cluster = match[0]
+        first = self._cluster_reps.get(item.cluster)
+        if first is not None and first[0] < item.index:
+            item.duplicate_of = first[1]
+        else:
+            self._cluster_reps[item.cluster] = (item.index, item.name)
+
+    async def _parse(self, items: List[_Item]) -> None:
+        pending = [item for item in items if item.parsed is None and item.duplicate_of is None]
+        for item in items:
+            if item.duplicate_of is not None:
+                item.segments = None
+        if not pending:
+            return
+        parsed = await self._offload(parse_extracted, [(item.raw_text, item.segments) for item in pending], self.batch_size)
+        for item, (fields, error) in zip(pending, parsed):
+            item.parsed, item.error, item.segments = fields, error, None
+            timed_out = item.extraction is not None and item.extraction.stopped == "time_limit"
+            if self.cache is not None and item.key is not None and error is None and not timed_out:
+                await asyncio.to_thread(self.cache.put, item.key, item.raw_text, item.parsed)
+
+    def _score_sync(self, item: _Item) -> Dict[str, Any]:
+        outcome = ParseOutcome(item.index, item.name, item.raw_text, item.parsed, None)
+        candidate, components = score_parsed(_candidate_name(outcome), item.parsed, self.requirements)
+        with self._semantic_lock:
+            self._semantic.observe(item.raw_text)
+            components["semantic"] = self._semantic.score(item.raw_text)
+        candidate["semantic_score"] = components["semantic"]
+        candidate["total_score"] = calculate_total_score(components)
+        candidate["file"] = item.name
+        return candidate
+
+    async def _score(self, item: _Item) -> None:
+        if item.duplicate_of is not None:
+            return
+        item.candidate = await asyncio.to_thread(self._score_sync, item)
+
+    async def _run_stage(self, stage: str, handler: Callable, inbox: asyncio.Queue, outbox: asyncio.Queue, batch_size: int = 0) -> None:
+        # With batch_size the handler gets a list of up to that many items:
+        # the first to arrive plus whatever is already queued behind it, so
+        # batching never waits for more work
+        stats = self._stats[stage]
+
+        async def _worker() -> None:
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    # Leave the marker for the stage's other workers
+                    inbox.put_nowait(_DONE)
+                    return
+                items = [item]
+                while len(items) < batch_size and not inbox.empty():
+                    item = inbox.get_nowait()
+                    if item is _DONE:
+                        inbox.put_nowait(_DONE)
+                        break
+                    items.append(item)
+                live = [item for item in items if item.error is None]
+                if live:
+                    stats.in_flight += len(live)
+                    start = time.perf_counter()
+                    try:
+                        with profiling.timed(f"pipeline.{stage}", live[0].name if len(live) == 1 else None):
+                            await handler(live if batch_size else live[0])
+                    except Exception as exc:
+                        for item in live:
+                            item.error = f"{type(exc).__name__}: {exc}"
+                        stats.failed += len(live)
+                    else:
+                        stats.failed += sum(item.error is not None for item in live)
+                    stats.in_flight -= len(live)
+                    stats.busy_s += time.perf_counter() - start
+                    stats.processed += len(live)
+                for item in items:
+                    await outbox.put(item)
+                stats.max_depth = max(stats.max_depth, inbox.qsize())
+
+        await asyncio.gather(*(_worker() for _ in range(max(1, self.concurrency[stage]))))
+        inbox.get_nowait()
+        await outbox.put(_DONE)
+
+    async def _feed(self, sources: Iterable[ResumeSource], inbox: asyncio.Queue) -> None:
+        # Sources are pulled one at a time, so a directory walk or upload
+        # stream is only read as fast as ingest drains its queue. Each pull
+        # runs in a thread, since walking a directory would block the loop.
+        it = iter(sources)
+        index = 0
+        while True:
+            source = await asyncio.to_thread(next, it, _DONE)
+            if source is _DONE:
+                break
+            await inbox.put(_Item(index, _normalize_source(source)))
+            index += 1
+            self._stats["ingest"].max_depth = max(self._stats["ingest"].max_depth, inbox.qsize())
+        await inbox.put(_DONE)
+
+    async def run(self, sources: Iterable[ResumeSource]) -> AsyncIterator[PipelineResult]:
+        handlers = {"ingest": self._ingest, "extract": self._extract, "dedup": self._dedup, "parse": self._parse, "score": self._score}
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        self._stats = {stage: _StageStats(queues[i], self.concurrency[stage]) for i, stage in enumerate(self.stages)}
+        self._output = queues[-1]
+        self._cluster_reps: Dict[str, Tuple[int, str]] = {}
+        self._semantic = StreamingSemanticScorer(self.job_description)
+        self._semantic_lock = threading.Lock()
+
+        own_executor = self.executor is None
+        if own_executor:
+            self.executor = create_parse_pool(self.workers)
+        tasks = [asyncio.ensure_future(self._feed(sources, queues[0]))]
+        tasks += [
+            asyncio.ensure_future(self._run_stage(
+                stage, handlers[stage], queues[i], queues[i + 1], self.batch_size if stage == "parse" else 0,
+            ))
+            for i, stage in enumerate(self.stages)
+        ]
+        try:
+            while True:
+                getter = asyncio.ensure_future(self._output.get())
+                # A failing stage task must not leave the consumer waiting forever
+                done, _ = await asyncio.wait([getter, *tasks], return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is not getter and task.exception() is not None:
+                        getter.cancel()
+                        raise task.exception()
+                tasks = [task for task in tasks if not task.done()]
+                item = await getter
+                if item is _DONE:
+                    return
+                yield item.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if own_executor:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
+
+    def stream(self, sources: Iterable[ResumeSource]) -> Iterator[PipelineResult]:
+        # Blocking bridge for the CLI and Streamlit: the event loop runs in a
+        # background thread and results are handed over through a queue of
+        # queue_size, so a slow consumer applies back-pressure to every stage
+        results: "queue.Queue" = queue.Queue(self.queue_size)
+        state: Dict[str, Any] = {}
+
+        async def _pump() -> None:
+            state["task"] = asyncio.current_task()
+            state["loop"] = asyncio.get_running_loop()
+            try:
+                async for result in self.run(sources):
+                    await asyncio.to_thread(results.put, result)
+            except asyncio.CancelledError:
+                pass
+            except Exception as exc:
+                state["error"] = exc
+            finally:
+                await asyncio.to_thread(results.put, _DONE)
+
+        # The loop thread runs in a copy of this context so timings land in
+        # the caller's profiling collector
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(asyncio.run, _pump()), name="skillsync-pipeline", daemon=True)
+        thread.start()
+        finished = False
+        try:
+            while True:
+                result = results.get()
+                if result is _DONE:
+                    finished = True
+                    break
+                yield result
+            if "error" in state:
+                raise state["error"]
+        finally:
+            # A consumer that stops early cancels the run, which shuts the
+            # stages and the process pool down
+            if not finished and "loop" in state:
+                state["loop"].call_soon_threadsafe(state["task"].cancel)
+            while thread.is_alive():
+                try:
+                    results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+def session_from_results(job_description: str, results: Iterable[PipelineResult]) -> ScreeningSession:
+    # Final ranking: outcomes are put back in source order and scored together
+    # so the result does not depend on which resume finished first. Each
+    # duplicate cluster is ranked as its lowest-indexed parsed member, with
+    # every other member listed under it.
+    outcomes: List[ParseOutcome] = []
+    clusters: Dict[str, List[PipelineResult]] = {}
+    for result in results:
+        if result.cluster is not None:
+            clusters.setdefault(result.cluster, []).append(result)
+        else:
+            outcomes.append(result.outcome)
+    duplicates: Dict[int, List[str]] = {}
+    for members in clusters.values():
+        members.sort(key=lambda result: result.outcome.index)
+        parsed = [result for result in members if result.duplicate_of is None and result.outcome.parsed is not None]
+        if not parsed:
+            outcomes.extend(result.outcome for result in members if result.duplicate_of is None)
+            continue
+        representative = parsed[0].outcome
+        outcomes.append(representative)
+        duplicates[representative.index] = [
+            result.outcome.name for result in members
+            if result.outcome is not representative and not result.outcome.error
+        ]
+    outcomes.sort(key=lambda outcome: outcome.index)
+    session = session_from_outcomes(job_description, outcomes)
+    session.duplicates = [duplicates.get(outcome.index, []) for outcome in outcomes if not outcome.error]
+    return session
@@ -0,0 +1,198 @@
+import contextlib
+import contextvars
+import functools
+import heapq
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+SLOWEST_ITEMS = 10
+
+class Collector:
+    # Per-stage counters and the slowest items of each stage
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._slowest: Dict[str, List[Tuple[float, str]]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._slowest.clear()
+
+    def _push_slowest(self, stage: str, seconds: float, item: str) -> None:
+        heap = self._slowest.setdefault(stage, [])
+        if len(heap) < SLOWEST_ITEMS:
+            heapq.heappush(heap, (seconds, item))
+        elif seconds > heap[0][0]:
+            heapq.heapreplace(heap, (seconds, item))
+
+    def record(self, stage: str, seconds: float, item: Optional[str] = None) -> None:
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {"count": 0, "total_s": 0.0, "max_s": 0.0}
+            stats["count"] += 1
+            stats["total_s"] += seconds
+            if seconds > stats["max_s"]:
+                stats["max_s"] = seconds
+            if item is not None:
+                self._push_slowest(stage, seconds, item)
+
+    def _export(self) -> Dict[str, Any]:
+        stages = {stage: dict(stats) for stage, stats in self._stages.items()}
+        slowest = {stage: sorted(heap, reverse=True) for stage, heap in self._slowest.items()}
+        return {"stages": stages, "slowest": {stage: [{"item": item, "seconds": s} for s, item in heap] for stage, heap in slowest.items()}}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._export()
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        # Folds in a snapshot taken elsewhere, e.g. inside a parse worker process
+        with self._lock:
+            for stage, stats in data.get("stages", {}).items():
+                current = self._stages.setdefault(stage, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+                current["count"] += stats["count"]
+                current["total_s"] += stats["total_s"]
+                current["max_s"] = max(current["max_s"], stats["max_s"])
+            for stage, entries in data.get("slowest", {}).items():
+                for entry in entries:
+                    self._push_slowest(stage, entry["seconds"], entry["item"])
+
+    def drain(self) -> Dict[str, Any]:
+        with self._lock:
+            data = self._export()
+            self._stages.clear()
+            self._slowest.clear()
+        return data
+
+# Timings go to the collector of the current run when there is one (see
+# collect()), so concurrent runs in one process, such as two Streamlit
+# sessions, never share counters. Otherwise they go to the process-wide
+# collector once enable() has been called, as in the service and the parse
+# worker processes.
+_enabled = False
+_global = Collector()
+_current: contextvars.ContextVar[Optional[Collector]] = contextvars.ContextVar("skillsync_profiling", default=None)
+
+def enable(flag: bool = True) -> None:
+    global _enabled
+    _enabled = flag
+
+def _active() -> Optional[Collector]:
+    collector = _current.get()
+    if collector is not None:
+        return collector
+    return _global if _enabled else None
+
+def is_enabled() -> bool:
+    return _active() is not None
+
+@contextlib.contextmanager
+def collect() -> Iterator[Collector]:
+    # Records everything timed in this context, including threads started
+    # with a copy of it (asyncio.to_thread does this), into a new collector
+    collector = Collector()
+    token = _current.set(collector)
+    try:
+        yield collector
+    finally:
+        _current.reset(token)
+
+def run_in_worker(profile: bool, func: Callable, *args) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    # For pool workers: func runs in a fresh context, so nothing inherited
+    # from the forking thread is recorded into, and with profile its timings
+    # come back as a snapshot for the parent to merge()
+    def _run() -> Tuple[Any, Optional[Dict[str, Any]]]:
+        if not profile:
+            return func(*args), None
+        with collect() as collector:
+            result = func(*args)
+        return result, collector.snapshot()
+    return contextvars.Context().run(_run)
+
+def _collector() -> Collector:
+    return _active() or _global
+
+def reset() -> None:
+    _collector().reset()
+
+def record(stage: str, seconds: float, item: Optional[str] = None) -> None:
+    collector = _active()
+    if collector is not None:
+        collector.record(stage, seconds, item)
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ("collector", "stage", "item", "start")
+
+    def __init__(self, collector: Collector, stage: str, item: Optional[str]):
+        self.collector = collector
+        self.stage = stage
+        self.item = item
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.collector.record(self.stage, time.perf_counter() - self.start, self.item)
+        return False
+
+def timed(stage: str, item: Optional[str] = None):
+    collector = _active()
+    if collector is None:
+        return _NULL_TIMER
+    return _Timer(collector, stage, item)
+
+def instrument(stage: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            collector = _active()
+            if collector is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                collector.record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def snapshot() -> Dict[str, Any]:
+    return _collector().snapshot()
+
+def merge(data: Dict[str, Any]) -> None:
+    _collector().merge(data)
+
+def drain() -> Dict[str, Any]:
+    return _collector().drain()
+
+def slowest_items(stage: str, n: int = SLOWEST_ITEMS) -> List[Dict[str, Any]]:
+    return snapshot()["slowest"].get(stage, [])[:n]
+
+def to_json(data: Optional[Dict[str, Any]] = None) -> str:
+    return json.dumps(snapshot() if data is None else data, indent=2)
+
+def to_prometheus(prefix: str = "skillsync", data: Optional[Dict[str, Any]] = None) -> str:
+    stages = (snapshot() if data is None else data)["stages"]
+    lines = [
+        f"# TYPE {prefix}_stage_calls_total counter",
+        *(f'{prefix}_stage_calls_total{{stage="{stage}"}} {stats["count"]}' for stage, stats in sorted(stages.items())),
+        f"# TYPE {prefix}_stage_seconds_total counter",
+        *(f'{prefix}_stage_seconds_total{{stage="{stage}"}} {stats["total_s"]:.6f}' for stage, stats in sorted(stages.items())),
+        f"# TYPE {prefix}_stage_max_seconds gauge",
+        *(f'{prefix}_stage_max_seconds{{stage="{stage}"}} {stats["max_s"]:.6f}' for stage, stats in sorted(stages.items())),
+    ]
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,8 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+import profiling
 
 WEIGHTS = {
     "skills": 0.40,
@@ -7,14 +11,55 @@ WEIGHTS = {
     "semantic": 0.20,
 }
 
-def calculate_total_score(components: Dict[str, float]) -> float:
+COMPONENTS = tuple(WEIGHTS)
+
+def calculate_total_score(components: Dict[str, float], weights: Optional[Dict[str, float]] = None) -> float:
     total = 0.0
-    for key, weight in WEIGHTS.items():
+    for key, weight in (weights or WEIGHTS).items():
         total += components.get(key, 0.0) * weight
     return total
 
-def rank_candidates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    sorted_candidates = sorted(candidates, key=lambda x: x.get("total_score", 0), reverse=True)
-    for idx, cand in enumerate(sorted_candidates, start=1):
+def weight_vector(weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    weights = weights or WEIGHTS
+    return np.array([weights.get(key, 0.0) for key in COMPONENTS], dtype=np.float64)
+
+def component_matrix(rows: List[Dict[str, float]]) -> np.ndarray:
+    matrix = np.zeros((len(rows), len(COMPONENTS)), dtype=np.float64)
+    for col, key in enumerate(COMPONENTS):
+        matrix[:, col] = [row.get(key, 0.0) for row in rows]
+    return matrix
+
+@profiling.instrument("scorer.total_scores")
+def calculate_total_scores(matrix: np.ndarray, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    # Components live on the last axis, so this handles both N x K and
+    # N x M x K. Accumulate column by column in WEIGHTS order so totals are
+    # bit-identical to calculate_total_score and ties break exactly as before
+    weights = weight_vector(weights)
+    totals = np.zeros(matrix.shape[:-1], dtype=np.float64)
+    for col in range(matrix.shape[-1]):
+        totals += matrix[..., col] * weights[col]
+    return totals
+
+def rank_order(totals: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    totals = np.asarray(totals, dtype=np.float64)
+    n = totals.shape[0]
+    if top_k is None or top_k >= n:
+        idx = np.arange(n)
+    elif top_k <= 0:
+        return np.empty(0, dtype=np.int64)
+    else:
+        head = np.argpartition(-totals, top_k - 1)[:top_k]
+        threshold = totals[head].min()
+        above = np.flatnonzero(totals > threshold)
+        ties = np.flatnonzero(totals == threshold)[: top_k - above.size]
+        idx = np.concatenate([above, ties])
+    # lexsort keys are applied last-first: score descending, then input order
+    return idx[np.lexsort((idx, -totals[idx]))]
+
+@profiling.instrument("scorer.rank_candidates")
+def rank_candidates(candidates: List[Dict[str, Any]], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    totals = np.fromiter((c.get("total_score", 0) for c in candidates), dtype=np.float64, count=len(candidates))
+    ranked = [candidates[i] for i in rank_order(totals, top_k)]
+    for idx, cand in enumerate(ranked, start=1):
         cand["rank"] = idx
-    return sorted_candidates
+    return ranked
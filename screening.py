@@ -0,0 +1,438 @@
+import os
+import re
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ann import SemanticIndex
+from cache import ParseCache
+from dedup import DuplicateIndex
+from store import CandidateStore
+from parser import ExtractionPolicy, ParseOutcome, ResumeSource, parse_resumes
+from matcher import (
+    calculate_skills_match, calculate_experience_match, calculate_education_match,
+    skills_match_matrix, experience_match_matrix, education_match_matrix,
+)
+from skills import find_skills, get_taxonomy
+from candidates import CandidatePool, CandidateRecord, candidate_dtype, mask_to_words, masks_to_words, words_to_mask
+from embeddings import StreamingSemanticScorer, semantic_scores, semantic_score_matrix
+from scorer import WEIGHTS, COMPONENTS, component_matrix, calculate_total_score, calculate_total_scores, rank_order
+
+RESUME_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
+DEFAULT_OVERSAMPLE = 4.0
+
+def extract_req_experience(job_description: str) -> str:
+    # Look for patterns like "0-1 Year", "3-5 years", "2+ years"
+    # Handles various dashes (hyphen, en-dash, em-dash)
+    pattern = r"(\d+)(?:\s*[-–]\s*(\d+))?\s*(?:years?|yrs?)"
+    match = re.search(pattern, job_description, re.IGNORECASE)
+    if match:
+        min_exp = match.group(1)
+        max_exp = match.group(2)
+        if max_exp:
+            return f"{min_exp}-{max_exp}"
+        else:
+            # Handle "3+ years" case -> treat as 3-10
+            return f"{min_exp}-10"
+    return "0-100" # Default fallback if no experience mentioned
+
+def build_requirements(job_description: str) -> Dict[str, Any]:
+    return {
+        "required_skills": find_skills(job_description),
+        "preferred_skills": [],
+        "experience_range": extract_req_experience(job_description),
+        "degree": "bachelor",
+    }
+
+def score_parsed(name: str, parsed: Dict[str, Any], requirements: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    skill_match = calculate_skills_match(parsed.get("skills", []), requirements["required_skills"], requirements["preferred_skills"])
+    exp_match = calculate_experience_match(parsed.get("total_experience_years", 0), requirements["experience_range"])
+    edu_match = calculate_education_match(parsed.get("education", []), requirements["degree"])
+
+    components = {
+        "skills": skill_match["skill_score"],
+        "experience": exp_match["experience_score"],
+        "education": edu_match["education_score"],
+    }
+    candidate = {
+        "name": name,
+        "skills_score": skill_match["skill_score"],
+        "matched_required": skill_match["matched_required"],
+        "missing_required": skill_match["missing_required"],
+        "matched_preferred": skill_match["matched_preferred"],
+        "missing_preferred": skill_match["missing_preferred"],
+        "experience_score": exp_match["experience_score"],
+        "candidate_years": exp_match["candidate_years"],
+        "required_range": exp_match["required_range"],
+        "education_score": edu_match["education_score"],
+        "required_degree": edu_match["required_degree"],
+    }
+    return candidate, components
+
+def _candidate_name(outcome: ParseOutcome) -> str:
+    return outcome.parsed.get("name", Path(outcome.name).stem)
+
+class ScreeningSession:
+    # Parsed features and the N x K component matrix of one screening run.
+    # Changing weights or a requirement recomputes only the affected column,
+    # so re-ranking never re-parses or re-embeds a resume.
+    def __init__(self, job_description: str, requirements: Dict[str, Any]):
+        self.job_description = job_description
+        self.requirements = dict(requirements)
+        self.weights = dict(WEIGHTS)
+        self.names: List[str] = []
+        self.files: List[str] = []
+        self.skill_words = np.zeros((0, 1), dtype="<u8")
+        self.years = np.empty(0, dtype=np.float64)
+        self.educations: List[List[Dict[str, str]]] = []
+        self.duplicates: List[List[str]] = []
+        self.components = np.zeros((0, len(COMPONENTS)), dtype=np.float64)
+        self.totals = np.empty(0, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _column(self, key: str) -> int:
+        return COMPONENTS.index(key)
+
+    def _requirement_mask(self, key: str) -> int:
+        return get_taxonomy().skill_mask(self.requirements[key])
+
+    def _match_pct(self, required_mask: int) -> np.ndarray:
+        required_count = required_mask.bit_count()
+        if not required_count:
+            return np.ones(len(self), dtype=np.float64)
+        # Skills interned after this session was built cannot be in any
+        # candidate's mask, so only the bits inside the stored width matter
+        n_words = self.skill_words.shape[1]
+        required_words = mask_to_words(required_mask & ((1 << (64 * n_words)) - 1), n_words)
+        matched = np.unpackbits((self.skill_words & required_words).view(np.uint8), axis=1).sum(axis=1)
+        return matched / required_count
+
+    def _rescore_totals(self) -> None:
+        self.totals = calculate_total_scores(self.components, self.weights)
+
+    def set_weights(self, weights: Dict[str, float]) -> None:
+        total = sum(weights.get(key, 0.0) for key in COMPONENTS)
+        if total <= 0:
+            raise ValueError("At least one weight must be positive")
+        weights = {key: weights.get(key, 0.0) / total for key in COMPONENTS}
+        if weights == self.weights:
+            return
+        self.weights = weights
+        self._rescore_totals()
+
+    def set_experience_range(self, experience_range: str) -> None:
+        if experience_range == self.requirements["experience_range"]:
+            return
+        self.requirements["experience_range"] = experience_range
+        self.components[:, self._column("experience")] = experience_match_matrix(self.years, [experience_range])[:, 0]
+        self._rescore_totals()
+
+    def set_degree(self, degree: str) -> None:
+        if degree == self.requirements["degree"]:
+            return
+        self.requirements["degree"] = degree
+        self.components[:, self._column("education")] = education_match_matrix(self.educations, [degree])[:, 0]
+        self._rescore_totals()
+
+    def set_required_skills(self, required_skills: List[str], preferred_skills: Optional[List[str]] = None) -> None:
+        preferred_skills = list(preferred_skills or [])
+        if required_skills == self.requirements["required_skills"] and preferred_skills == self.requirements["preferred_skills"]:
+            return
+        self.requirements["required_skills"] = list(required_skills)
+        self.requirements["preferred_skills"] = preferred_skills
+        # Same arithmetic as calculate_skills_match, on popcounts of the masks
+        required_mask = self._requirement_mask("required_skills")
+        preferred_mask = self._requirement_mask("preferred_skills")
+        req_match_pct = self._match_pct(required_mask)
+        pref_match_pct = self._match_pct(preferred_mask)
+        self.components[:, self._column("skills")] = req_match_pct * 0.8 + pref_match_pct * 0.2
+        self._rescore_totals()
+
+    def _record(self, index: int, required_mask: int, preferred_mask: int, weights: Dict[str, float], rank: Optional[int] = None) -> CandidateRecord:
+        row = self.components[index]
+        return CandidateRecord(
+            name=self.names[index],
+            skills_score=float(row[self._column("skills")]),
+            experience_score=float(row[self._column("experience")]),
+            education_score=float(row[self._column("education")]),
+            semantic_score=float(row[self._column("semantic")]),
+            total_score=float(self.totals[index]),
+            candidate_years=self.years[index].item(),
+            skills_mask=words_to_mask(self.skill_words[index]),
+            required_mask=required_mask,
+            preferred_mask=preferred_mask,
+            required_range=self.requirements["experience_range"],
+            required_degree=self.requirements["degree"],
+            weights=weights,
+            rank=rank,
+            duplicates=self.duplicates[index],
+        )
+
+    def candidate(self, index: int) -> CandidateRecord:
+        return self._record(index, self._requirement_mask("required_skills"), self._requirement_mask("preferred_skills"), dict(self.weights))
+
+    def ranked(self, top_k: Optional[int] = None, offset: int = 0) -> List[CandidateRecord]:
+        # Records of one ranking share the requirement masks and weights dict;
+        # offset skips the first ranks so a page of a large pool costs its own size
+        required_mask = self._requirement_mask("required_skills")
+        preferred_mask = self._requirement_mask("preferred_skills")
+        weights = dict(self.weights)
+        return [
+            self._record(int(index), required_mask, preferred_mask, weights, rank)
+            for rank, index in enumerate(rank_order(self.totals, top_k)[offset:], start=offset + 1)
+        ]
+
+    def pool(self) -> CandidatePool:
+        data = np.zeros(len(self), dtype=candidate_dtype(self.skill_words.shape[1]))
+        data["name"] = self.names
+        for col, key in enumerate(COMPONENTS):
+            data[f"{key}_score"] = self.components[:, col]
+        data["total_score"] = self.totals
+        data["candidate_years"] = self.years
+        data["skills"] = self.skill_words
+        return CandidatePool(
+            data,
+            self._requirement_mask("required_skills"),
+            self._requirement_mask("preferred_skills"),
+            self.requirements["experience_range"],
+            self.requirements["degree"],
+            dict(self.weights),
+        )
+
+def session_from_outcomes(
+    job_description: str,
+    outcomes: Iterable[ParseOutcome],
+    dedup: Optional[DuplicateIndex] = None,
+    dedup_threshold: Optional[float] = None,
+) -> ScreeningSession:
+    session = ScreeningSession(job_description, build_requirements(job_description))
+
+    years = []
+    skill_masks = []
+    resume_texts = []
+    component_rows = []
+    # Near-duplicates reuse the result of the first member of their cluster
+    # seen in this run and are listed on it instead of ranked separately. The
+    # cluster's stored representative may be from an earlier session, so rows
+    # are looked up by cluster key, which is a content hash, never by name.
+    cluster_rows: Dict[str, int] = {}
+
+    for outcome in outcomes:
+        if outcome.error:
+            continue
+        if dedup is not None:
+            match = dedup.assign(outcome.raw_text, dedup_threshold)
+            if match is not None:
+                cluster, _ = match
+                row = cluster_rows.get(cluster)
+                if row is not None:
+                    session.duplicates[row].append(outcome.name)
+                    continue
+                cluster_rows[cluster] = len(session.names)
+        candidate, components = score_parsed(_candidate_name(outcome), outcome.parsed, session.requirements)
+        session.names.append(candidate["name"])
+        session.files.append(outcome.name)
+        skill_masks.append(get_taxonomy().skill_mask(outcome.parsed.get("skills", [])))
+        session.educations.append(outcome.parsed.get("education", []))
+        session.duplicates.append([])
+        years.append(candidate["candidate_years"])
+        resume_texts.append(outcome.raw_text)
+        component_rows.append(components)
+
+    # Fit TF-IDF once on the JD plus every resume so scores don't depend on upload order
+    for components, semantic_score in zip(component_rows, semantic_scores(job_description, resume_texts)):
+        components["semantic"] = float(semantic_score)
+    session.years = np.asarray(years, dtype=np.float64)
+    session.skill_words = masks_to_words(skill_masks)
+    session.components = component_matrix(component_rows)
+    session._rescore_totals()
+    return session
+
+def build_session(
+    sources: Iterable[ResumeSource],
+    job_description: str,
+    workers: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    on_progress: Optional[Callable[[int, ParseOutcome], None]] = None,
+    dedup: Optional[DuplicateIndex] = None,
+    policy: Optional[ExtractionPolicy] = None,
+    dedup_threshold: Optional[float] = None,
+) -> ScreeningSession:
+    def _outcomes() -> Iterator[ParseOutcome]:
+        for i, outcome in enumerate(parse_resumes(sources, workers=workers, cache=cache, policy=policy)):
+            if on_progress is not None:
+                on_progress(i + 1, outcome)
+            yield outcome
+
+    return session_from_outcomes(job_description, _outcomes(), dedup, dedup_threshold)
+
+def screen_resumes(
+    sources: Iterable[ResumeSource],
+    job_description: str,
+    workers: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    on_progress: Optional[Callable[[int, ParseOutcome], None]] = None,
+    dedup: Optional[DuplicateIndex] = None,
+    policy: Optional[ExtractionPolicy] = None,
+    dedup_threshold: Optional[float] = None,
+) -> List[CandidateRecord]:
+    return build_session(sources, job_description, workers, cache, on_progress, dedup, policy, dedup_threshold).ranked()
+
+def shortlist_session(
+    store: CandidateStore,
+    index: SemanticIndex,
+    job_description: str,
+    top_k: int = 200,
+    oversample: float = DEFAULT_OVERSAMPLE,
+) -> ScreeningSession:
+    # The index shortlists the top_k * oversample semantic neighbours of the
+    # JD and only those are scored exactly; session.files holds their store
+    # ids. Semantic similarity is one weighted component of the total, so
+    # oversample trades recall of the final top_k against exact scoring cost.
+    # Removals should go to both the store and index.remove(); ids the store
+    # no longer has are skipped in case they did not.
+    shortlist = index.search(job_description, max(top_k, int(np.ceil(top_k * oversample))))
+    outcomes = []
+    for candidate_id, _ in shortlist:
+        if candidate_id not in store:
+            continue
+        record = store.get(candidate_id)
+        outcomes.append(ParseOutcome(len(outcomes), str(candidate_id), record["raw_text"], record["parsed"], None))
+    return session_from_outcomes(job_description, outcomes)
+
+def screen_matrix(
+    sources: Iterable[ResumeSource],
+    job_descriptions: Sequence[str],
+    workers: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    on_progress: Optional[Callable[[int, ParseOutcome], None]] = None,
+    top_k: Optional[int] = None,
+    policy: Optional[ExtractionPolicy] = None,
+) -> Dict[str, Any]:
+    # Each resume is parsed once; every JD is then scored against the whole
+    # pool with N x M matrix operations instead of N x M scoring calls
+    names = []
+    files = []
+    parsed_list = []
+    resume_texts = []
+    for i, outcome in enumerate(parse_resumes(sources, workers=workers, cache=cache, policy=policy)):
+        if on_progress is not None:
+            on_progress(i + 1, outcome)
+        if outcome.error:
+            continue
+        names.append(_candidate_name(outcome))
+        files.append(outcome.name)
+        parsed_list.append(outcome.parsed)
+        resume_texts.append(outcome.raw_text)
+
+    return score_matrix(names, files, parsed_list, resume_texts, job_descriptions, top_k)
+
+def score_matrix(
+    names: List[str],
+    files: List[str],
+    parsed_list: List[Dict[str, Any]],
+    resume_texts: List[str],
+    job_descriptions: Sequence[str],
+    top_k: Optional[int] = None,
+) -> Dict[str, Any]:
+    requirements = [build_requirements(jd) for jd in job_descriptions]
+    components = np.zeros((len(parsed_list), len(job_descriptions), len(COMPONENTS)), dtype=np.float64)
+    components[..., COMPONENTS.index("skills")] = skills_match_matrix(
+        [p.get("skills", []) for p in parsed_list], [r["required_skills"] for r in requirements])
+    components[..., COMPONENTS.index("experience")] = experience_match_matrix(
+        [p.get("total_experience_years", 0) for p in parsed_list], [r["experience_range"] for r in requirements])
+    components[..., COMPONENTS.index("education")] = education_match_matrix(
+        [p.get("education", []) for p in parsed_list], [r["degree"] for r in requirements])
+    components[..., COMPONENTS.index("semantic")] = semantic_score_matrix(list(job_descriptions), resume_texts)
+    scores = calculate_total_scores(components)
+
+    rankings = []
+    for j in range(len(job_descriptions)):
+        ranking = []
+        for rank, i in enumerate(rank_order(scores[:, j], top_k), start=1):
+            row = {"rank": rank, "name": names[i], "file": files[i], "total_score": float(scores[i, j])}
+            for c, key in enumerate(COMPONENTS):
+                row[f"{key}_score"] = float(components[i, j, c])
+            ranking.append(row)
+        rankings.append(ranking)
+
+    best_roles = []
+    if len(job_descriptions):
+        best = scores.argmax(axis=1)
+        for i, j in enumerate(best):
+            best_roles.append({"name": names[i], "file": files[i], "best_job": int(j), "total_score": float(scores[i, j])})
+
+    return {
+        "names": names,
+        "files": files,
+        "scores": scores,
+        "components": components,
+        "rankings": rankings,
+        "best_roles": best_roles,
+    }
+
+def iter_resume_files(root: str) -> Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if Path(filename).suffix.lower() in RESUME_EXTENSIONS:
+                yield Path(dirpath) / filename
+
+def iter_screen(
+    sources: Iterable[ResumeSource],
+    job_description: str,
+    workers: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    on_progress: Optional[Callable[[int, ParseOutcome], None]] = None,
+    policy: Optional[ExtractionPolicy] = None,
+    on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    outcomes = parse_resumes(sources, workers=workers, cache=cache, policy=policy)
+    return iter_screen_outcomes(outcomes, job_description, on_progress, on_candidate)
+
+def iter_screen_outcomes(
+    outcomes: Iterable[ParseOutcome],
+    job_description: str,
+    on_progress: Optional[Callable[[int, ParseOutcome], None]] = None,
+    on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    # Two passes over a disk spool: the first takes parse outcomes and
+    # accumulates document frequencies, the second scores. Memory is bounded
+    # by the parse window and the hashed DF array, not by the number of resumes.
+    # Final candidates are only yielded by the second pass; on_candidate gets
+    # each one as it is parsed, scored against the documents seen so far, with
+    # "provisional" set since its semantic and total scores will still change.
+    requirements = build_requirements(job_description)
+    scorer = StreamingSemanticScorer(job_description)
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        for i, outcome in enumerate(outcomes):
+            if on_progress is not None:
+                on_progress(i + 1, outcome)
+            if outcome.error:
+                continue
+            candidate, components = score_parsed(_candidate_name(outcome), outcome.parsed, requirements)
+            candidate["file"] = outcome.name
+            scorer.observe(outcome.raw_text)
+            spool.write(json.dumps({"candidate": candidate, "components": components, "raw_text": outcome.raw_text}, ensure_ascii=False))
+            spool.write("\n")
+            if on_candidate is not None:
+                semantic = scorer.score(outcome.raw_text)
+                on_candidate({
+                    **candidate,
+                    "semantic_score": semantic,
+                    "total_score": calculate_total_score({**components, "semantic": semantic}),
+                    "provisional": True,
+                })
+        spool.seek(0)
+        for line in spool:
+            record = json.loads(line)
+            candidate, components = record["candidate"], record["components"]
+            components["semantic"] = scorer.score(record["raw_text"])
+            candidate["semantic_score"] = components["semantic"]
+            candidate["total_score"] = calculate_total_score(components)
+            yield candidate
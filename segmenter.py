@@ -0,0 +1,194 @@
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from skills import tokenize
+
+EMAIL_REGEX = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+PHONE_REGEX = re.compile(r"(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4})")
+LINKEDIN_REGEX = re.compile(r"linkedin\.com/in/[^\s/]+")
+
+_CONTACT_REGEXES = {"email": EMAIL_REGEX, "phone": PHONE_REGEX, "linkedin": LINKEDIN_REGEX}
+
+# A line is a heading when, stripped of punctuation and case, it is one of
+# these phrases
+_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "objective", "about me"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies"),
+    "experience": (
+        "experience", "work experience", "professional experience", "relevant experience",
+        "work history", "employment", "employment history",
+    ),
+    "education": ("education", "academic background"),
+    "projects": ("projects", "personal projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications"),
+    "other": ("awards", "publications", "languages", "interests", "volunteer experience", "references"),
+}
+_HEADING_KINDS = {phrase: kind for kind, phrases in _HEADINGS.items() for phrase in phrases}
+_HEADING_PUNCT = r"[ \t\r:\-–—•*#|]*"
+_HEADING_REGEX = re.compile(
+    rf"^{_HEADING_PUNCT}(?P<phrase>"
+    + "|".join(
+        r"[ \t]+".join("(?:and|&)" if word == "and" else re.escape(word) for word in phrase.split())
+        for phrase in sorted(_HEADING_KINDS, key=len, reverse=True)
+    )
+    + rf"){_HEADING_PUNCT}$",
+    re.I | re.M,
+)
+
+# Resumes without a heading line for these kinds fall back to the first
+# mention of the keyword anywhere, which is how sections used to be found
+_MENTION_REGEXES = {
+    "experience": re.compile(r"experience|work history|professional experience", re.I),
+    "education": re.compile(r"education|academic background", re.I),
+}
+
+HEADER = "header"
+
+class Section(NamedTuple):
+    kind: str
+    heading: str
+    start: int
+    end: int
+
+class _Heading(NamedTuple):
+    kind: str
+    text: str
+    line_start: int
+    body_start: int
+
+class Segmentation:
+    # A resume split into typed sections. Offsets index into text, so spaCy
+    # spans and regex matches from different extractors line up.
+    __slots__ = ("text", "line_starts", "lines", "tokens", "sections", "contacts")
+
+    def __init__(
+        self,
+        text: str,
+        line_starts: List[int],
+        lines: List[str],
+        tokens: List[str],
+        sections: List[Section],
+        contacts: Dict[str, str],
+    ):
+        self.text = text
+        self.line_starts = line_starts
+        self.lines = lines
+        self.tokens = tokens
+        self.sections = sections
+        self.contacts = contacts
+
+    def sections_of(self, kind: str) -> List[Section]:
+        return [section for section in self.sections if section.kind == kind]
+
+    def line_index(self, offset: int) -> int:
+        return max(0, bisect_right(self.line_starts, offset) - 1)
+
+    def line(self, index: int, section: Optional[Section] = None) -> Tuple[int, str]:
+        # (offset, text) of a line, clipped to the section when one is given
+        start = self.line_starts[index]
+        line = self.lines[index]
+        if section is not None:
+            if start < section.start:
+                line = line[section.start - start:]
+                start = section.start
+            line = line[:section.end - start]
+        return start, line
+
+    def section_lines(self, section: Section) -> Iterator[Tuple[int, str]]:
+        # A section that starts mid-line yields the rest of that line first
+        i = self.line_index(section.start)
+        while i < len(self.lines) and self.line_starts[i] < section.end:
+            yield self.line(i, section)
+            i += 1
+
+    def lines_of(self, kind: str) -> Iterator[Tuple[int, str]]:
+        for section in self.sections_of(kind):
+            yield from self.section_lines(section)
+
+class Segmenter:
+    # Incremental single-pass segmentation. feed() takes text in any chunks
+    # (e.g. PDF pages); each run of complete lines is split, tokenised and
+    # searched for headings and contact details once, by whole-block regex
+    # scans rather than per-line calls.
+    def __init__(self):
+        self._parts: List[str] = []
+        self._pending = ""
+        self._pos = 0
+        self.line_starts: List[int] = []
+        self.lines: List[str] = []
+        self.tokens: List[str] = []
+        self.contacts: Dict[str, str] = {}
+        self._headings: List[_Heading] = []
+        self._mentions: Dict[str, int] = {}
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._parts.append(chunk)
+        block = self._pending + chunk
+        raw_lines = block.splitlines(keepends=True)
+        last = raw_lines[-1]
+        # A trailing "\r" may be the first half of a "\r\n" in the next chunk
+        if last.endswith("\r") or last == last.splitlines()[0]:
+            self._pending = raw_lines.pop()
+            block = block[:len(block) - len(self._pending)]
+        else:
+            self._pending = ""
+        if raw_lines:
+            self._scan(block, raw_lines)
+
+    def _scan(self, block: str, raw_lines: List[str]) -> None:
+        base = self._pos
+        self.line_starts.extend(accumulate(map(len, raw_lines[:-1]), initial=base))
+        self.lines.extend(block.splitlines())
+        self._pos += len(block)
+        self.tokens.extend(tokenize(block))
+        for match in _HEADING_REGEX.finditer(block):
+            line_end = block.find("\n", match.end())
+            kind = _HEADING_KINDS[" ".join(match.group("phrase").lower().replace("&", "and").split())]
+            body_start = base + (len(block) if line_end < 0 else line_end + 1)
+            self._headings.append(_Heading(kind, match.group(0).strip(), base + match.start(), body_start))
+        for key, regex in _CONTACT_REGEXES.items():
+            if key not in self.contacts:
+                match = regex.search(block)
+                if match:
+                    self.contacts[key] = match.group(0)
+        for kind, regex in _MENTION_REGEXES.items():
+            if kind not in self._mentions:
+                match = regex.search(block)
+                if match:
+                    self._mentions[kind] = base + match.end()
+
+    def has_sections(self, kinds: Iterable[str]) -> bool:
+        # True once a heading of every kind has been seen and closed by a
+        # later heading, so no more text can belong to those sections
+        closed = {heading.kind for heading in self._headings[:-1]}
+        return all(kind in closed for kind in kinds)
+
+    def close(self) -> Segmentation:
+        if self._pending:
+            self._scan(self._pending, [self._pending])
+            self._pending = ""
+        text = "".join(self._parts)
+        headings = self._headings
+        heading_starts = [heading.line_start for heading in headings]
+        bounds = heading_starts + [len(text)]
+
+        sections = []
+        if not headings or headings[0].line_start > 0:
+            sections.append(Section(HEADER, "", 0, bounds[0]))
+        for heading, end in zip(headings, bounds[1:]):
+            sections.append(Section(heading.kind, heading.text, heading.body_start, end))
+        found = {heading.kind for heading in headings}
+        for kind, offset in self._mentions.items():
+            if kind not in found:
+                sections.append(Section(kind, "", offset, bounds[bisect_right(heading_starts, offset)]))
+        sections.sort(key=lambda section: section.start)
+        return Segmentation(text, self.line_starts, self.lines, self.tokens, sections, self.contacts)
+
+def segment(text: str) -> Segmentation:
+    segmenter = Segmenter()
+    segmenter.feed(text)
+    return segmenter.close()
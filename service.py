@@ -0,0 +1,481 @@
+import base64
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import profiling
+from cache import ParseCache
+from parser import ExtractionPolicy, create_parse_pool, parse_resumes
+from screening import _candidate_name, score_matrix
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+MAX_BODY_BYTES = 64 * 1024 * 1024
+DEFAULT_RETENTION = 3600.0
+_FINISHED = ("done", "failed")
+
+class ServiceBusy(Exception):
+    pass
+
+class ServiceStopped(Exception):
+    pass
+
+class RecordInUse(Exception):
+    pass
+
+class ScreeningService:
+    # Uploads and job submissions only enqueue work. One thread drains the
+    # resume queue into micro-batches for the parse pool, another coalesces
+    # concurrent jobs so every JD waiting on the same resumes is scored in a
+    # single N x M pass. Finished resumes and jobs are kept for `retention`
+    # seconds (None: until deleted), except resumes an unfinished job needs.
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache: Optional[ParseCache] = None,
+        max_pending_resumes: int = 1000,
+        max_pending_jobs: int = 64,
+        batch_window: float = 0.05,
+        max_batch_resumes: int = 64,
+        max_batch_jobs: int = 16,
+        policy: Optional[ExtractionPolicy] = None,
+        retention: Optional[float] = DEFAULT_RETENTION,
+    ):
+        self.workers = workers
+        self.cache = cache
+        self.policy = policy
+        self.max_pending_resumes = max_pending_resumes
+        self.max_pending_jobs = max_pending_jobs
+        self.batch_window = batch_window
+        self.max_batch_resumes = max_batch_resumes
+        self.max_batch_jobs = max_batch_jobs
+        self.retention = retention
+        self.resumes: Dict[str, Dict[str, Any]] = {}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.counters = {"resumes_parsed": 0, "resumes_failed": 0, "jobs_completed": 0, "jobs_failed": 0,
+                         "parse_batches": 0, "score_batches": 0, "rejected": 0, "evicted": 0,
+                         "pool_restarts": 0}
+        self._pending_resumes: List[Tuple[str, bytes]] = []
+        self._pending_jobs: List[str] = []
+        self._changed = threading.Condition()
+        self._stopping = False
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._threads: List[threading.Thread] = []
+        self._next_eviction = 0.0
+
+    def start(self) -> None:
+        self._pool = create_parse_pool(self.workers)
+        self._threads = [
+            threading.Thread(target=self._parse_loop, name="skillsync-parse", daemon=True),
+            threading.Thread(target=self._score_loop, name="skillsync-score", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        for thread in self._threads:
+            thread.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def _check_capacity(self, pending: int, limit: int, incoming: int) -> None:
+        if self._stopping:
+            raise ServiceStopped("Service is shutting down")
+        if pending + incoming > limit:
+            self.counters["rejected"] += 1
+            raise ServiceBusy(f"Queue is full ({pending} pending, limit {limit})")
+
+    def submit_resumes(self, uploads: List[Tuple[str, bytes]]) -> List[str]:
+        with self._changed:
+            self._check_capacity(len(self._pending_resumes), self.max_pending_resumes, len(uploads))
+            self._evict_expired()
+            resume_ids = []
+            for name, data in uploads:
+                resume_id = uuid.uuid4().hex
+                self.resumes[resume_id] = {"name": name, "status": "queued", "raw_text": None, "parsed": None, "error": None,
+                                           "finished_at": None}
+                self._pending_resumes.append((resume_id, data))
+                resume_ids.append(resume_id)
+            self._changed.notify_all()
+        return resume_ids
+
+    def submit_job(self, job_description: str, resume_ids: Optional[List[str]] = None, top_k: Optional[int] = None) -> str:
+        with self._changed:
+            self._check_capacity(len(self._pending_jobs), self.max_pending_jobs, 1)
+            self._evict_expired()
+            if resume_ids is None:
+                resume_ids = [rid for rid, record in self.resumes.items() if record["status"] != "failed"]
+            unknown = [rid for rid in resume_ids if rid not in self.resumes]
+            if unknown:
+                raise KeyError(f"Unknown resume ids: {', '.join(unknown)}")
+            job_id = uuid.uuid4().hex
+            self.jobs[job_id] = {
+                "job_description": job_description,
+                "resume_ids": list(resume_ids),
+                "top_k": top_k,
+                "status": "queued",
+                "submitted_at": time.time(),
+                "finished_at": None,
+                "ranking": None,
+                "error": None,
+            }
+            self._pending_jobs.append(job_id)
+            self._changed.notify_all()
+        return job_id
+
+    def _in_use(self) -> set:
+        return {rid for job in self.jobs.values() if job["status"] not in _FINISHED for rid in job["resume_ids"]}
+
+    def _evict_expired(self) -> None:
+        # Called under the lock on submissions, at most once per second
+        now = time.time()
+        if self.retention is None or now < self._next_eviction:
+            return
+        self._next_eviction = now + 1.0
+        cutoff = now - self.retention
+        expired_jobs = [job_id for job_id, job in self.jobs.items() if job["status"] in _FINISHED and job["finished_at"] < cutoff]
+        for job_id in expired_jobs:
+            del self.jobs[job_id]
+        in_use = self._in_use()
+        expired_resumes = [
+            rid for rid, record in self.resumes.items()
+            if record["status"] in _FINISHED and record["finished_at"] < cutoff and rid not in in_use
+        ]
+        for rid in expired_resumes:
+            del self.resumes[rid]
+        self.counters["evicted"] += len(expired_jobs) + len(expired_resumes)
+
+    def delete_resume(self, resume_id: str) -> bool:
+        with self._changed:
+            record = self.resumes.get(resume_id)
+            if record is None:
+                return False
+            if record["status"] not in _FINISHED or resume_id in self._in_use():
+                raise RecordInUse(f"Resume {resume_id} is still being parsed or scored")
+            del self.resumes[resume_id]
+            return True
+
+    def delete_job(self, job_id: str) -> bool:
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return False
+            if job["status"] not in _FINISHED:
+                raise RecordInUse(f"Job {job_id} has not finished")
+            del self.jobs[job_id]
+            return True
+
+    def resume_status(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        with self._changed:
+            record = self.resumes.get(resume_id)
+            if record is None:
+                return None
+            status = {"resume_id": resume_id, "name": record["name"], "status": record["status"], "error": record["error"]}
+            if record["status"] == "done":
+                status["parsed"] = record["parsed"]
+                status["extraction"] = record.get("extraction")
+            return status
+
+    def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            status = {key: job[key] for key in ("status", "submitted_at", "finished_at", "error")}
+            status["job_id"] = job_id
+            if job["status"] == "done":
+                status["ranking"] = job["ranking"]
+            return status
+
+    def health(self) -> Dict[str, Any]:
+        with self._changed:
+            return {
+                "status": "stopping" if self._stopping else "ok",
+                "pending_resumes": len(self._pending_resumes),
+                "pending_jobs": len(self._pending_jobs),
+                "resumes": len(self.resumes),
+                "jobs": len(self.jobs),
+            }
+
+    def metrics(self, prefix: str = "skillsync") -> str:
+        health = self.health()
+        with self._changed:
+            counters = dict(self.counters)
+        lines = [
+            f"# TYPE {prefix}_queue_depth gauge",
+            f'{prefix}_queue_depth{{queue="resumes"}} {health["pending_resumes"]}',
+            f'{prefix}_queue_depth{{queue="jobs"}} {health["pending_jobs"]}',
+            f"# TYPE {prefix}_service_events_total counter",
+            *(f'{prefix}_service_events_total{{event="{event}"}} {count}' for event, count in sorted(counters.items())),
+        ]
+        return "\n".join(lines) + "\n" + profiling.to_prometheus(prefix)
+
+    def _take_batch(self, queue: List, limit: int, ready=None) -> List:
+        # Wait for the first item, then hold the batch open for batch_window so
+        # concurrent requests land in the same micro-batch
+        with self._changed:
+            self._changed.wait_for(lambda: self._stopping or any(ready is None or ready(item) for item in queue))
+            if self._stopping:
+                return []
+        time.sleep(self.batch_window)
+        with self._changed:
+            taken = [i for i, item in enumerate(queue) if ready is None or ready(item)][:limit]
+            batch = [queue[i] for i in taken]
+            for i in reversed(taken):
+                del queue[i]
+            return batch
+
+    def _parse_loop(self) -> None:
+        while True:
+            batch = self._take_batch(self._pending_resumes, self.max_batch_resumes)
+            if not batch:
+                return
+            with self._changed:
+                for resume_id, _ in batch:
+                    self.resumes[resume_id]["status"] = "parsing"
+            try:
+                try:
+                    self._parse_batch(batch)
+                except BrokenProcessPool:
+                    # A worker died, say OOM-killed on a huge PDF, and took the
+                    # pool with it; what the batch did not get to gets one more
+                    # try on a fresh pool
+                    self._replace_pool()
+                    self._parse_batch(batch)
+            except Exception as exc:
+                # Whatever the batch did not get to fails with it, and the loop
+                # keeps serving later uploads
+                with self._changed:
+                    for resume_id, _ in batch:
+                        record = self.resumes[resume_id]
+                        if record["status"] == "parsing":
+                            record.update(status="failed", error=f"{type(exc).__name__}: {exc}", finished_at=time.time())
+                            self.counters["resumes_failed"] += 1
+            with self._changed:
+                self.counters["parse_batches"] += 1
+                self._changed.notify_all()
+
+    def _parse_batch(self, batch: List[Tuple[str, bytes]]) -> None:
+        with self._changed:
+            pending = [(resume_id, data) for resume_id, data in batch if self.resumes[resume_id]["status"] == "parsing"]
+            sources = [(self.resumes[resume_id]["name"], data) for resume_id, data in pending]
+        broken = False
+        for outcome in parse_resumes(sources, cache=self.cache, pool=self._pool, policy=self.policy):
+            resume_id = pending[outcome.index][0]
+            # Chunks in flight when a worker dies fail with the pool
+            broken = broken or (outcome.error or "").startswith(BrokenProcessPool.__name__)
+            with self._changed:
+                record = self.resumes[resume_id]
+                if outcome.error:
+                    record.update(status="failed", error=outcome.error, finished_at=time.time())
+                    self.counters["resumes_failed"] += 1
+                else:
+                    record.update(status="done", raw_text=outcome.raw_text, parsed=outcome.parsed, finished_at=time.time())
+                    record["extraction"] = outcome.extraction._asdict() if outcome.extraction else None
+                    record["candidate_name"] = _candidate_name(outcome)
+                    self.counters["resumes_parsed"] += 1
+        if broken:
+            self._replace_pool()
+
+    def _replace_pool(self) -> None:
+        # Only the parse thread uses the pool, so it can be swapped here
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = create_parse_pool(self.workers)
+        with self._changed:
+            self.counters["pool_restarts"] += 1
+
+    def _job_ready(self, job_id: str) -> bool:
+        return all(self.resumes[rid]["status"] in ("done", "failed") for rid in self.jobs[job_id]["resume_ids"])
+
+    def _score_loop(self) -> None:
+        while True:
+            batch = self._take_batch(self._pending_jobs, self.max_batch_jobs, ready=self._job_ready)
+            if not batch:
+                return
+            groups: Dict[Tuple[str, ...], List[str]] = {}
+            with self._changed:
+                for job_id in batch:
+                    job = self.jobs[job_id]
+                    job["status"] = "running"
+                    parsed_ids = tuple(rid for rid in job["resume_ids"] if self.resumes[rid]["status"] == "done")
+                    groups.setdefault(parsed_ids, []).append(job_id)
+            for resume_ids, job_ids in groups.items():
+                try:
+                    self._score_group(resume_ids, job_ids)
+                except Exception as exc:
+                    # A job that breaks scoring fails alone; the loop keeps
+                    # running the ones queued behind it
+                    self._fail_jobs(job_ids, exc)
+            with self._changed:
+                self.counters["score_batches"] += 1
+
+    def _fail_jobs(self, job_ids: List[str], exc: Exception) -> None:
+        with self._changed:
+            for job_id in job_ids:
+                job = self.jobs[job_id]
+                if job["status"] not in _FINISHED:
+                    job.update(status="failed", error=f"{type(exc).__name__}: {exc}", finished_at=time.time())
+                    self.counters["jobs_failed"] += 1
+
+    def _score_group(self, resume_ids: Tuple[str, ...], job_ids: List[str]) -> None:
+        # Jobs over the same resume set share one TF-IDF fit and one scoring pass
+        records = [self.resumes[rid] for rid in resume_ids]
+        jobs = [self.jobs[job_id] for job_id in job_ids]
+        try:
+            result = score_matrix(
+                [record["candidate_name"] for record in records],
+                list(resume_ids),
+                [record["parsed"] for record in records],
+                [record["raw_text"] for record in records],
+                [job["job_description"] for job in jobs],
+            )
+        except Exception as exc:
+            self._fail_jobs(job_ids, exc)
+            return
+        with self._changed:
+            for job, ranking in zip(jobs, result["rankings"]):
+                for row in ranking:
+                    row["resume_id"] = row.pop("file")
+                    row["file"] = self.resumes[row["resume_id"]]["name"]
+                if job["top_k"] is not None:
+                    ranking = ranking[:job["top_k"]]
+                job.update(status="done", ranking=ranking, finished_at=time.time())
+                self.counters["jobs_completed"] += 1
+
+class ScreeningRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SkillSync/1.0"
+    service: ScreeningService = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: Any, content_type: str = "application/json", headers: Optional[Dict[str, str]] = None) -> None:
+        body = payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        return self.rfile.read(length)
+
+    def _read_json(self) -> Dict[str, Any]:
+        payload = json.loads(self._read_body() or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object")
+        return payload
+
+    def _resume_uploads(self, url) -> List[Tuple[str, bytes]]:
+        # Either a JSON list of {"name", "content" (base64) or "text"} or a raw
+        # file body named by the ?name= query parameter
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            items = self._read_json().get("resumes", [])
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                raise ValueError("resumes must be a list of objects")
+            uploads = []
+            for item in items:
+                name = item.get("name", "resume.txt")
+                if not isinstance(name, str):
+                    raise ValueError("Resume names must be strings")
+                if "text" in item:
+                    if not isinstance(item["text"], str):
+                        raise ValueError("Resume text must be a string")
+                    uploads.append((name, item["text"].encode("utf-8")))
+                elif isinstance(item.get("content"), str):
+                    uploads.append((name, base64.b64decode(item["content"])))
+                else:
+                    raise ValueError("Each resume needs a text string or base64 content")
+            return uploads
+        name = parse_qs(url.query).get("name", [None])[0]
+        if not name:
+            raise ValueError("Raw uploads need a ?name= query parameter")
+        return [(name, self._read_body())]
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["health"]:
+            health = self.service.health()
+            self._send(200 if health["status"] == "ok" else 503, health)
+        elif parts == ["metrics"]:
+            self._send(200, self.service.metrics(), content_type="text/plain; version=0.0.4")
+        elif len(parts) == 2 and parts[0] == "jobs":
+            status = self.service.job_status(parts[1])
+            self._send(404, {"error": "Unknown job"}) if status is None else self._send(200, status)
+        elif len(parts) == 2 and parts[0] == "resumes":
+            status = self.service.resume_status(parts[1])
+            self._send(404, {"error": "Unknown resume"}) if status is None else self._send(200, status)
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            if url.path == "/resumes":
+                resume_ids = self.service.submit_resumes(self._resume_uploads(url))
+                self._send(202, {"resume_ids": resume_ids})
+            elif url.path == "/jobs":
+                payload = self._read_json()
+                if not payload.get("job_description") or not isinstance(payload["job_description"], str):
+                    raise ValueError("job_description is required")
+                top_k = payload.get("top_k")
+                if top_k is not None and (not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 0):
+                    raise ValueError("top_k must be a non-negative integer or null")
+                resume_ids = payload.get("resume_ids")
+                if resume_ids is not None and (not isinstance(resume_ids, list) or not all(isinstance(rid, str) for rid in resume_ids)):
+                    raise ValueError("resume_ids must be a list of strings")
+                job_id = self.service.submit_job(payload["job_description"], resume_ids, top_k)
+                self._send(202, {"job_id": job_id, "status": "queued"})
+            else:
+                self._send(404, {"error": "Not found"})
+        except ServiceBusy as exc:
+            self._send(429, {"error": str(exc)}, headers={"Retry-After": "1"})
+        except ServiceStopped as exc:
+            self._send(503, {"error": str(exc)})
+        except KeyError as exc:
+            self._send(400, {"error": exc.args[0]})
+        except (ValueError, TypeError) as exc:
+            self._send(400, {"error": str(exc)})
+
+    def do_DELETE(self):
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        deletes = {"resumes": self.service.delete_resume, "jobs": self.service.delete_job}
+        if len(parts) != 2 or parts[0] not in deletes:
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            deleted = deletes[parts[0]](parts[1])
+        except RecordInUse as exc:
+            self._send(409, {"error": str(exc)})
+            return
+        self._send(200, {"deleted": parts[1]}) if deleted else self._send(404, {"error": f"Unknown {parts[0][:-1]}"})
+
+def create_server(service: ScreeningService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    handler = type("BoundScreeningRequestHandler", (ScreeningRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+def serve(service: ScreeningService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    server = create_server(service, host, port)
+    service.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
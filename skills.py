@@ -0,0 +1,125 @@
+import hashlib
+import json
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent / "data" / "skills.json"
+
+_TOKEN_REGEX = re.compile(r"[A-Za-z0-9#+.]+")
+_END = ""
+
+def tokenize(text: str) -> List[str]:
+    # Tokens are ASCII, so ASCII text can be lowercased in one call up front;
+    # other text is lowercased per token so case folding cannot create tokens
+    if text.isascii():
+        raws = _TOKEN_REGEX.findall(text.lower())
+    else:
+        raws = [raw.lower() for raw in _TOKEN_REGEX.findall(text)]
+    return [token for token in (raw.rstrip(".") for raw in raws) if token]
+
+class SkillTaxonomy:
+    def __init__(self, entries: Dict[str, List[str]]):
+        # Identifies the entries, so results cached under one taxonomy are
+        # not served after data/skills.json changes
+        self.digest = hashlib.sha1(json.dumps(entries, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self.canonical: Set[str] = set()
+        self.aliases: Dict[str, str] = {}
+        self._trie: Dict[str, dict] = {}
+        self.max_phrase_len = 0
+        for skill, synonyms in entries.items():
+            canonical = skill.lower()
+            self.canonical.add(canonical)
+            for phrase in (skill, *synonyms):
+                self._add_phrase(phrase, canonical)
+        # Stable ids for bitmask skill sets; skills outside the taxonomy are
+        # interned on first use and appended after the canonical ones
+        self.vocabulary: List[str] = sorted(self.canonical)
+        self._skill_ids: Dict[str, int] = {skill: i for i, skill in enumerate(self.vocabulary)}
+        self._intern_lock = threading.Lock()
+
+    def _add_phrase(self, phrase: str, canonical: str) -> None:
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        self.aliases[" ".join(tokens)] = canonical
+        self.aliases.setdefault(phrase.lower(), canonical)
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = canonical
+        self.max_phrase_len = max(self.max_phrase_len, len(tokens))
+
+    def normalize(self, skill: str) -> str:
+        s = skill.lower()
+        if s in self.aliases:
+            return self.aliases[s]
+        return self.aliases.get(" ".join(tokenize(s)), s)
+
+    def skill_id(self, skill: str) -> int:
+        skill = self.normalize(skill)
+        skill_id = self._skill_ids.get(skill)
+        if skill_id is None:
+            with self._intern_lock:
+                skill_id = self._skill_ids.get(skill)
+                if skill_id is None:
+                    skill_id = self._skill_ids[skill] = len(self.vocabulary)
+                    self.vocabulary.append(skill)
+        return skill_id
+
+    def skill_mask(self, skills: Iterable[str]) -> int:
+        mask = 0
+        for skill in skills:
+            mask |= 1 << self.skill_id(skill)
+        return mask
+
+    def skills_from_mask(self, mask: int) -> List[str]:
+        skills = []
+        while mask:
+            low = mask & -mask
+            skills.append(self.vocabulary[low.bit_length() - 1])
+            mask ^= low
+        return skills
+
+    def find(self, text: str) -> List[str]:
+        return self.find_tokens(tokenize(text))
+
+    def find_tokens(self, tokens: List[str]) -> List[str]:
+        return sorted({skill for skill, _, _ in self.find_spans(tokens)})
+
+    def find_spans(self, tokens: List[str]) -> List[Tuple[str, int, int]]:
+        # Leftmost-longest walk of the token trie; each start position explores
+        # at most max_phrase_len tokens so the scan stays linear in the text
+        matches = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = self._trie
+            best = None
+            j = i
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    best = (node[_END], j)
+            if best is None:
+                i += 1
+            else:
+                matches.append((best[0], i, best[1]))
+                i = best[1]
+        return matches
+
+def load_taxonomy(path: Path = DEFAULT_TAXONOMY_PATH) -> SkillTaxonomy:
+    with open(path, encoding="utf-8") as f:
+        return SkillTaxonomy(json.load(f))
+
+@lru_cache(maxsize=1)
+def get_taxonomy() -> SkillTaxonomy:
+    return load_taxonomy()
+
+def find_skills(text: str) -> List[str]:
+    return get_taxonomy().find(text)
@@ -0,0 +1,181 @@
+import argparse
+import json
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+import profiling
+from cache import ParseCache
+from parser import DEFAULT_EXTRACTION_POLICY, ExtractionPolicy
+from pipeline import DEFAULT_QUEUE_SIZE, STAGES, ScreeningPipeline
+from scorer import rank_order
+from screening import iter_resume_files, iter_screen, iter_screen_outcomes, screen_matrix
+from service import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_RETENTION, ScreeningService, serve
+
+def _report(done: int, outcome) -> None:
+    if outcome.error:
+        print(f"[{done}] skipped {outcome.name}: {outcome.error}", file=sys.stderr)
+        return
+    # Cache hits carry no extraction report; PDFs show the backend and pages read
+    report = outcome.extraction
+    detail = ""
+    if report is not None and report.total_pages:
+        detail = f" ({report.backend}, {report.pages}/{report.total_pages} pages"
+        detail += f", stopped at {report.stopped})" if report.stopped else ")"
+    print(f"[{done}] parsed {outcome.name}{detail}", file=sys.stderr)
+
+def _policy(args: argparse.Namespace) -> ExtractionPolicy:
+    return ExtractionPolicy(
+        backends=tuple(backend.strip() for backend in args.pdf_backends.split(",") if backend.strip()),
+        max_pages=args.pdf_max_pages or None,
+        max_bytes=args.pdf_max_bytes or None,
+        time_limit=args.pdf_time_limit or None,
+        stop_after=() if args.pdf_read_all else DEFAULT_EXTRACTION_POLICY.stop_after,
+    )
+
+def _stage_concurrency(spec: str) -> Dict[str, int]:
+    concurrency = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        stage, _, count = part.partition("=")
+        if stage not in STAGES or not count.isdigit():
+            raise SystemExit(f"Invalid stage concurrency {part!r}; expected e.g. extract=4,parse=2 with stages {', '.join(STAGES)}")
+        concurrency[stage] = int(count)
+    return concurrency
+
+def _add_extraction_arguments(command: argparse.ArgumentParser) -> None:
+    policy = DEFAULT_EXTRACTION_POLICY
+    command.add_argument("--pdf-backends", default=",".join(policy.backends), help="PDF backends to try in order (pypdf2, pdfplumber)")
+    command.add_argument("--pdf-max-pages", type=int, default=policy.max_pages, help="Pages read per PDF (0: no limit)")
+    command.add_argument("--pdf-max-bytes", type=int, default=policy.max_bytes, help="Extracted text bytes per PDF (0: no limit)")
+    command.add_argument("--pdf-time-limit", type=float, default=policy.time_limit, help="Seconds per PDF, checked between pages (0: no limit)")
+    command.add_argument("--pdf-read-all", action="store_true", help="Keep reading after the skills, experience and education sections are complete")
+
+def screen_command(args: argparse.Namespace) -> int:
+    job_description = Path(args.jd).read_text(encoding="utf-8")
+    cache = None if args.no_cache else ParseCache()
+    results_path = Path(args.output)
+    ranked_path = Path(args.ranked)
+
+    totals = array("d")
+    offsets = array("q")
+    with open(results_path, "w", encoding="utf-8") as results, tempfile.TemporaryFile("w+", encoding="utf-8") as final:
+        # Rows reach the results file as each resume is parsed, with
+        # provisional semantic and total scores; the ranked file has the
+        # final ones. Only scores and spool offsets are kept in memory.
+        def _write_result(candidate) -> None:
+            results.write(json.dumps(candidate, ensure_ascii=False) + "\n")
+            results.flush()
+
+        pipeline = None
+        if args.pipeline:
+            pipeline = ScreeningPipeline(job_description, cache=cache, policy=_policy(args), workers=args.workers,
+                                         concurrency=_stage_concurrency(args.stage_concurrency), queue_size=args.queue_size,
+                                         score=False)
+            outcomes = (result.outcome for result in pipeline.stream(iter_resume_files(args.resumes)))
+            candidates = iter_screen_outcomes(outcomes, job_description, on_progress=_report, on_candidate=_write_result)
+        else:
+            candidates = iter_screen(iter_resume_files(args.resumes), job_description, workers=args.workers, cache=cache,
+                                     on_progress=_report, policy=_policy(args), on_candidate=_write_result)
+
+        for candidate in candidates:
+            offsets.append(final.tell())
+            totals.append(candidate["total_score"])
+            final.write(json.dumps(candidate, ensure_ascii=False) + "\n")
+
+        order = rank_order(np.asarray(totals, dtype=np.float64), args.top_k)
+        final_offsets = np.asarray(offsets, dtype=np.int64)
+        with open(ranked_path, "w", encoding="utf-8") as ranked:
+            for rank, idx in enumerate(order, start=1):
+                final.seek(int(final_offsets[idx]))
+                candidate = json.loads(final.readline())
+                candidate["rank"] = rank
+                ranked.write(json.dumps(candidate, ensure_ascii=False) + "\n")
+
+    if cache is not None:
+        print(json.dumps({"parse_cache": cache.stats()}), file=sys.stderr)
+    if pipeline is not None:
+        print(json.dumps({"pipeline": pipeline.metrics()}), file=sys.stderr)
+    print(f"Screened {len(totals)} resumes -> {results_path}, ranking -> {ranked_path}", file=sys.stderr)
+    return 0
+
+def matrix_command(args: argparse.Namespace) -> int:
+    job_descriptions = [Path(jd).read_text(encoding="utf-8") for jd in args.jd]
+    cache = None if args.no_cache else ParseCache()
+    result = screen_matrix(iter_resume_files(args.resumes), job_descriptions, workers=args.workers, cache=cache,
+                           on_progress=_report, top_k=args.top_k, policy=_policy(args))
+    payload = {
+        "job_descriptions": args.jd,
+        "rankings": {jd: ranking for jd, ranking in zip(args.jd, result["rankings"])},
+        "best_roles": [{**row, "best_job": args.jd[row["best_job"]]} for row in result["best_roles"]],
+    }
+    Path(args.output).write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Scored {len(result['names'])} resumes against {len(job_descriptions)} roles -> {args.output}", file=sys.stderr)
+    return 0
+
+def serve_command(args: argparse.Namespace) -> int:
+    profiling.enable(True)
+    service = ScreeningService(
+        workers=args.workers,
+        cache=None if args.no_cache else ParseCache(),
+        max_pending_resumes=args.max_pending_resumes,
+        max_pending_jobs=args.max_pending_jobs,
+        batch_window=args.batch_window,
+        policy=_policy(args),
+        retention=args.retention or None,
+    )
+    print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    serve(service, args.host, args.port)
+    return 0
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(prog="skillsync", description="Skill-Sync headless resume screening")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    screen = commands.add_parser("screen", help="Screen a directory of resumes against a job description")
+    screen.add_argument("--jd", required=True, help="Path to the job description text file")
+    screen.add_argument("--resumes", required=True, help="Directory searched recursively for PDF, DOCX and TXT resumes")
+    screen.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    screen.add_argument("--output", default="results.jsonl", help="Per-candidate JSONL, one row per resume as it is parsed; semantic and total scores are provisional")
+    screen.add_argument("--ranked", default="ranked.jsonl", help="Final ranked JSONL file with final scores")
+    screen.add_argument("--top-k", type=int, default=None, help="Only write the top K candidates to the ranked file")
+    screen.add_argument("--no-cache", action="store_true", help="Disable the persistent parse cache")
+    screen.add_argument("--pipeline", action="store_true", help="Overlap reading, extraction, parsing and scoring in a staged pipeline")
+    screen.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Resumes queued between pipeline stages")
+    screen.add_argument("--stage-concurrency", default="", help="Per-stage workers for --pipeline, e.g. ingest=8,extract=4,parse=4")
+    _add_extraction_arguments(screen)
+    screen.set_defaults(func=screen_command)
+
+    matrix = commands.add_parser("matrix", help="Rank resumes against several job descriptions in one pass")
+    matrix.add_argument("--jd", required=True, action="append", help="Job description text file (repeat for each role)")
+    matrix.add_argument("--resumes", required=True, help="Directory searched recursively for PDF, DOCX and TXT resumes")
+    matrix.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    matrix.add_argument("--output", default="matrix.json", help="Per-role rankings and best role per candidate")
+    matrix.add_argument("--top-k", type=int, default=None, help="Only keep the top K candidates per role")
+    matrix.add_argument("--no-cache", action="store_true", help="Disable the persistent parse cache")
+    _add_extraction_arguments(matrix)
+    matrix.set_defaults(func=matrix_command)
+
+    server = commands.add_parser("serve", help="Run the local HTTP screening service")
+    server.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind (default: localhost only)")
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    server.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    server.add_argument("--max-pending-resumes", type=int, default=1000, help="Queued resumes before uploads get HTTP 429")
+    server.add_argument("--max-pending-jobs", type=int, default=64, help="Queued jobs before submissions get HTTP 429")
+    server.add_argument("--batch-window", type=float, default=0.05, help="Seconds to wait for concurrent requests to join a batch")
+    server.add_argument("--retention", type=float, default=DEFAULT_RETENTION,
+                        help="Seconds finished resumes and jobs are kept before eviction (0: until deleted)")
+    server.add_argument("--no-cache", action="store_true", help="Disable the persistent parse cache")
+    _add_extraction_arguments(server)
+    server.set_defaults(func=serve_command)
+    return arg_parser
+
+def main(argv=None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from matcher import _normalize_skill
+
+class CandidateStore:
+    def __init__(self):
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._skill_index: Dict[str, Set[int]] = {}
+        self._years = np.empty(0, dtype=np.float64)
+        self._year_ids = np.empty(0, dtype=np.int64)
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, candidate_id: int) -> bool:
+        return candidate_id in self._records
+
+    def add(self, parsed: Dict[str, Any], raw_text: str = "", candidate_id: Optional[int] = None) -> int:
+        if candidate_id is None:
+            candidate_id = self._next_id
+        elif candidate_id in self._records:
+            self.remove(candidate_id)
+        self._next_id = max(self._next_id, candidate_id + 1)
+        self._records[candidate_id] = {"parsed": parsed, "raw_text": raw_text}
+        for skill in self._skills_of(parsed):
+            self._skill_index.setdefault(skill, set()).add(candidate_id)
+        years = np.float64(parsed.get("total_experience_years", 0.0) or 0.0)
+        pos = int(np.searchsorted(self._years, years, side="right"))
+        self._years = np.insert(self._years, pos, years)
+        self._year_ids = np.insert(self._year_ids, pos, candidate_id)
+        return candidate_id
+
+    def add_many(self, items: Iterable[Dict[str, Any]]) -> List[int]:
+        ids = []
+        years = []
+        for item in items:
+            candidate_id = self._next_id
+            self._next_id += 1
+            parsed = item["parsed"]
+            self._records[candidate_id] = {"parsed": parsed, "raw_text": item.get("raw_text", "")}
+            for skill in self._skills_of(parsed):
+                self._skill_index.setdefault(skill, set()).add(candidate_id)
+            ids.append(candidate_id)
+            years.append(parsed.get("total_experience_years", 0.0) or 0.0)
+        self._merge_years(np.asarray(years, dtype=np.float64), np.asarray(ids, dtype=np.int64))
+        return ids
+
+    def remove(self, candidate_id: int) -> None:
+        record = self._records.pop(candidate_id)
+        for skill in self._skills_of(record["parsed"]):
+            postings = self._skill_index.get(skill)
+            if postings is not None:
+                postings.discard(candidate_id)
+                if not postings:
+                    del self._skill_index[skill]
+        keep = self._year_ids != candidate_id
+        self._years = self._years[keep]
+        self._year_ids = self._year_ids[keep]
+
+    def get(self, candidate_id: int) -> Dict[str, Any]:
+        return self._records[candidate_id]
+
+    def query(
+        self,
+        required_skills: Iterable[str] = (),
+        min_years: Optional[float] = None,
+        max_years: Optional[float] = None,
+        min_matched: int = 1,
+    ) -> List[int]:
+        required = {_normalize_skill(s) for s in required_skills}
+        ids: Optional[Set[int]] = None
+        if required and min_matched > 0:
+            counts = Counter()
+            for skill in required:
+                counts.update(self._skill_index.get(skill, ()))
+            ids = {cid for cid, matched in counts.items() if matched >= min_matched}
+        if min_years is not None or max_years is not None:
+            lo = 0 if min_years is None else int(np.searchsorted(self._years, min_years, side="left"))
+            hi = len(self._years) if max_years is None else int(np.searchsorted(self._years, max_years, side="right"))
+            in_range = self._year_ids[lo:hi]
+            ids = set(in_range.tolist()) if ids is None else ids.intersection(in_range.tolist())
+        if ids is None:
+            return sorted(self._records)
+        return sorted(ids)
+
+    def save(self, path: str) -> None:
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        records = {str(cid): record for cid, record in self._records.items()}
+        with open(directory / "candidates.json", "w", encoding="utf-8") as f:
+            json.dump({"next_id": self._next_id, "records": records}, f, ensure_ascii=False)
+        np.savez(directory / "experience.npz", years=self._years, ids=self._year_ids)
+
+    @classmethod
+    def load(cls, path: str) -> "CandidateStore":
+        directory = Path(path)
+        store = cls()
+        with open(directory / "candidates.json", encoding="utf-8") as f:
+            data = json.load(f)
+        store._next_id = data["next_id"]
+        for cid, record in data["records"].items():
+            candidate_id = int(cid)
+            store._records[candidate_id] = record
+            for skill in store._skills_of(record["parsed"]):
+                store._skill_index.setdefault(skill, set()).add(candidate_id)
+        arrays = np.load(directory / "experience.npz")
+        store._years = arrays["years"].astype(np.float64)
+        store._year_ids = arrays["ids"]
+        return store
+
+    def _merge_years(self, years: np.ndarray, ids: np.ndarray) -> None:
+        all_years = np.concatenate([self._years, years])
+        all_ids = np.concatenate([self._year_ids, ids])
+        order = np.argsort(all_years, kind="stable")
+        self._years = all_years[order]
+        self._year_ids = all_ids[order]
+
+    @staticmethod
+    def _skills_of(parsed: Dict[str, Any]) -> Set[str]:
+        return {_normalize_skill(s) for s in parsed.get("skills", [])}
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from parser import ParseOutcome
+from screening import session_from_outcomes
+
+APP = str(Path(__file__).resolve().parent.parent / "app.py")
+
+def _outcome(index, name, skills, years=0):
+    parsed = {"name": name, "skills": skills, "education": [], "total_experience_years": years}
+    return ParseOutcome(index, f"{name.lower()}.txt", f"{name} {' '.join(skills)}", parsed, None)
+
+def _run_with_session(session):
+    app = AppTest.from_file(APP, default_timeout=30)
+    app.session_state["screening"] = session
+    app.session_state["screening_run"] = 1
+    return app.run()
+
+def test_tuning_controls_accept_jd_without_years():
+    # No years in the JD means an open-ended "0-100" range, which is above
+    # the maximum years widget's limit
+    session = session_from_outcomes("Python developer", [_outcome(0, "Alice", ["python"], 3)])
+    assert session.requirements["experience_range"] == "0-100"
+    app = _run_with_session(session)
+    assert not app.exception
+    assert app.sidebar.checkbox(key="no_max_years_1").value
+    assert session.requirements["experience_range"] == "0-100"
+
+def test_results_without_candidates():
+    failed = ParseOutcome(0, "broken.pdf", "", None, "ValueError: no text")
+    app = _run_with_session(session_from_outcomes("Python developer, 2+ years", [failed]))
+    assert not app.exception
+    assert app.info[-1].value.startswith("No candidates to rank")
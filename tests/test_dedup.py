@@ -0,0 +1,23 @@
+import json
+
+from dedup import DuplicateIndex
+
+TEXTS = [f"Resume {i}: Python, SQL and Docker with {i} years at company {i * 7}" for i in range(5)]
+
+def test_load_skips_files_from_different_saves(tmp_path):
+    index = DuplicateIndex(tmp_path)
+    for text in TEXTS:
+        index.assign(text, threshold=1.0)
+    index.save()
+    assert len(DuplicateIndex(tmp_path)) == len(TEXTS)
+
+    # meta.json from a later save than signatures.npy
+    meta_path = tmp_path / "meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["keys"].append("0" * 32)
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    assert len(DuplicateIndex(tmp_path)) == 0
+
+    meta_path.write_text("{", encoding="utf-8")
+    assert len(DuplicateIndex(tmp_path)) == 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["meta.json", "signatures.npy"]
@@ -0,0 +1,101 @@
+import json
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+RESUMES = [
+    {"name": "alice.txt", "text": "Alice Smith\nSkills\nPython, SQL, Docker\nEducation\nBachelor of Science"},
+    {"name": "bob.txt", "text": "Bob Jones\nSkills\nJava, Spring Boot\nEducation\nMaster of Science"},
+]
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def base_url():
+    # The service runs as its own process, as `skillsync serve` would, so its
+    # parse pool never forks from a test process full of other threads
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(ROOT / "skillsync.py"), "serve", "--port", str(port), "--workers", "1", "--no-cache", "--batch-window", "0.01"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while True:
+        try:
+            urllib.request.urlopen(url + "/health", timeout=1).close()
+            break
+        except OSError:
+            if server.poll() is not None or time.time() > deadline:
+                server.kill()
+                raise
+            time.sleep(0.1)
+    yield url
+    # Ctrl-C is what serve() shuts its worker pool down on
+    server.send_signal(signal.SIGINT)
+    server.wait(timeout=30)
+
+def _request(base_url, method, path, payload=None):
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(base_url + path, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+def _wait_for_job(base_url, job_id):
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        _, status = _request(base_url, "GET", f"/jobs/{job_id}")
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+def test_screening_round_trip(base_url):
+    status, body = _request(base_url, "POST", "/resumes", {"resumes": RESUMES})
+    assert status == 202
+    resume_ids = body["resume_ids"]
+
+    status, body = _request(base_url, "POST", "/jobs", {"job_description": "Python developer with SQL", "resume_ids": resume_ids})
+    assert status == 202
+    job = _wait_for_job(base_url, body["job_id"])
+    assert job["status"] == "done"
+    assert [row["file"] for row in job["ranking"]] == ["alice.txt", "bob.txt"]
+
+    assert _request(base_url, "DELETE", f"/jobs/{body['job_id']}")[0] == 200
+    assert _request(base_url, "GET", f"/jobs/{body['job_id']}")[0] == 404
+    assert _request(base_url, "DELETE", f"/resumes/{resume_ids[0]}")[0] == 200
+    assert _request(base_url, "GET", f"/resumes/{resume_ids[0]}")[0] == 404
+
+def test_rejects_non_object_resume_items(base_url):
+    status, body = _request(base_url, "POST", "/resumes", {"resumes": ["not an object"]})
+    assert status == 400
+    assert "objects" in body["error"]
+    assert _request(base_url, "GET", "/health")[0] == 200
+
+def test_rejects_malformed_fields_and_keeps_scoring(base_url):
+    assert _request(base_url, "POST", "/resumes", {"resumes": [{"name": "a.txt", "text": 5}]})[0] == 400
+    status, body = _request(base_url, "POST", "/resumes", {"resumes": RESUMES})
+    resume_ids = body["resume_ids"]
+    for top_k in ("5", -1, 1.5, True):
+        payload = {"job_description": "Python developer", "resume_ids": resume_ids, "top_k": top_k}
+        assert _request(base_url, "POST", "/jobs", payload)[0] == 400
+
+    status, body = _request(base_url, "POST", "/jobs", {"job_description": "Python developer", "resume_ids": resume_ids, "top_k": 1})
+    job = _wait_for_job(base_url, body["job_id"])
+    assert job["status"] == "done"
+    assert [row["file"] for row in job["ranking"]] == ["alice.txt"]
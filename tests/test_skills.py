@@ -0,0 +1,16 @@
+from skills import SkillTaxonomy, find_skills
+
+def test_names_and_plain_words_are_not_skills():
+    text = ("Julia Ruby\nSpring 2019: led a hive of volunteers with swift response, rust removal, "
+            "soap and puppet shows, an elk survey, communication and leadership")
+    assert find_skills(text) == []
+
+def test_multi_token_forms_still_match():
+    text = "Spring Boot, Spring Framework, Apache Spark, PySpark, HiveQL, Rust programming, SwiftUI, ELK stack"
+    assert find_skills(text) == [
+        "apache hive", "apache spark", "elk stack", "rust language", "spring boot", "spring framework", "swift language",
+    ]
+
+def test_digest_follows_entries():
+    assert SkillTaxonomy({"python": []}).digest == SkillTaxonomy({"python": []}).digest
+    assert SkillTaxonomy({"python": []}).digest != SkillTaxonomy({"python": ["py"]}).digest
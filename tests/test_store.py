@@ -0,0 +1,15 @@
+from store import CandidateStore
+
+def _parsed(skills, years):
+    return {"skills": skills, "total_experience_years": years}
+
+def test_query_years_bounds_are_inclusive(tmp_path):
+    store = CandidateStore()
+    ids = store.add_many([{"parsed": _parsed(["python"], years)} for years in (1.9, 2.1, 3.3)])
+    assert store.query(min_years=2.1) == ids[1:]
+    assert store.query(max_years=2.1) == ids[:2]
+    assert store.query(min_years=2.1, max_years=2.1) == [ids[1]]
+    store.add(_parsed(["sql"], 3.3))
+    store.save(str(tmp_path))
+    loaded = CandidateStore.load(str(tmp_path))
+    assert loaded.query(["python"], min_years=3.3) == [ids[2]]